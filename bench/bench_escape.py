@@ -0,0 +1,109 @@
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import corpus
+import htmlnode
+from htmlnode import LeafNode, WHITESPACE_TAGS, collapse_whitespace
+from markdown_to_html_node import markdown_to_html_node
+
+REPEAT = 25
+
+
+# Serialization as it was before escaping, for comparison (see without_escaping)
+def unescaped_leaf_to_html(self, minify=False):
+    if self.value is None:
+        raise ValueError("Leaf nodes must have a value")
+    value = self.value
+    if minify and self.tag not in WHITESPACE_TAGS:
+        value = collapse_whitespace(value)
+    if self.tag is None:
+        return value
+    return f"<{self.tag}{self.props_to_html(minify)}>{value}</{self.tag}>"
+
+
+def unescaped_format_attribute(key, value, minify=False):
+    return f'{key}="{value}"'
+
+
+@contextmanager
+def without_escaping():
+    originals = LeafNode.to_html, htmlnode.format_attribute
+    LeafNode.to_html, htmlnode.format_attribute = unescaped_leaf_to_html, unescaped_format_attribute
+    try:
+        yield
+    finally:
+        LeafNode.to_html, htmlnode.format_attribute = originals
+
+
+def serialize(trees):
+    start = time.perf_counter()
+    for tree in trees:
+        tree.to_html()
+    return time.perf_counter() - start
+
+
+def render(documents):
+    start = time.perf_counter()
+    for document in documents:
+        markdown_to_html_node(document).to_html()
+    return time.perf_counter() - start
+
+
+def compare_render(label, documents):
+    # Whole markdown to HTML rendering, what a build pays per page
+    escaped = unescaped = None
+    for _ in range(REPEAT):
+        elapsed = render(documents)
+        escaped = elapsed if escaped is None else min(escaped, elapsed)
+        with without_escaping():
+            elapsed = render(documents)
+        unescaped = elapsed if unescaped is None else min(unescaped, elapsed)
+    report(label, unescaped, escaped)
+
+
+def report(label, unescaped, escaped):
+    overhead = (escaped / unescaped - 1) * 100
+    print(f"{label:<32} unescaped {unescaped * 1000:7.2f} ms  escaped {escaped * 1000:7.2f} ms  overhead {overhead:+5.1f}%")
+
+
+def compare(label, documents, fresh):
+    # Alternating both serializers and keeping the best run of each, so machine noise hits both alike.
+    # Fresh trees have nothing cached from an earlier render.
+    trees = [markdown_to_html_node(document) for document in documents]
+    escaped = unescaped = None
+    for _ in range(REPEAT):
+        if fresh:
+            trees = [markdown_to_html_node(document) for document in documents]
+        elapsed = serialize(trees)
+        escaped = elapsed if escaped is None else min(escaped, elapsed)
+
+        if fresh:
+            trees = [markdown_to_html_node(document) for document in documents]
+        with without_escaping():
+            elapsed = serialize(trees)
+        unescaped = elapsed if unescaped is None else min(unescaped, elapsed)
+    report(label, unescaped, escaped)
+
+
+def main():
+    corpora = corpus.generate(0.5)
+    prose = [markdown for _, markdown in corpora["prose"]]
+    links = [markdown for _, markdown in corpora["links"]]
+    # Text where nearly every span needs escaping, the slow path
+    dirty = [markdown.replace(" the ", " <the> & ") for markdown in prose]
+
+    compare_render("render prose", prose)
+    compare_render("render links", links)
+    compare_render("render text needing escapes", dirty)
+    compare("to_html prose", prose, True)
+    compare("to_html prose, rendered again", prose, False)
+    compare("to_html links", links, True)
+    compare("to_html text needing escapes", dirty, True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from textnode import TextNode, TextType
+from inline_markdown import split_nodes_delimiter, split_nodes_image, split_nodes_link, text_to_textnodes
+
+# Inline-heavy paragraph, repeated to build a long document
+PARAGRAPH = (
+    "This has **bold** and _italic_ text and a `code` span. It links to "
+    "[the docs](https://example.com/docs) and shows an ![image](https://example.com/img.png), "
+    "then more **strong words** next to _emphasis_ and `moreCode()`. "
+)
+
+
+def five_pass_text_to_textnodes(text):
+    # The previous pipeline: one full pass over the node list per syntax
+    nodes = [TextNode(text, TextType.TEXT)]
+    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
+    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
+    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
+    nodes = split_nodes_image(nodes)
+    nodes = split_nodes_link(nodes)
+    return nodes
+
+
+def main():
+    for repeat in (1, 10, 100):
+        text = PARAGRAPH * repeat
+        assert five_pass_text_to_textnodes(text) == text_to_textnodes(text)
+        number = max(1, 2000 // repeat)
+        old = min(timeit.repeat(lambda: five_pass_text_to_textnodes(text), number=number, repeat=5))
+        new = min(timeit.repeat(lambda: text_to_textnodes(text), number=number, repeat=5))
+        print(
+            f"{len(text):>7} chars: five-pass {old / number * 1e6:9.1f} us, "
+            f"single-pass {new / number * 1e6:9.1f} us, speedup {old / new:.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
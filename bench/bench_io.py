@@ -0,0 +1,58 @@
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import build
+import corpus
+from bench_parallel import tree_digest
+
+TEMPLATE = "<html><head><title>{{ Title }}</title></head><body>{{ Content }}</body></html>"
+# Added to every source read, roughly a round trip to a network filesystem
+LATENCIES_MS = (0, 2)
+
+
+def make_site(root):
+    content = os.path.join(root, "content")
+    for rel_path, markdown in corpus.generate(0.5, 1234)["small_files"]:
+        path = os.path.join(content, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(markdown)
+    with open(os.path.join(root, "template.html"), "w", encoding="utf-8") as file:
+        file.write(TEMPLATE)
+    return content
+
+
+def main():
+    read_source = build.read_source
+    with tempfile.TemporaryDirectory() as root:
+        content = make_site(root)
+        template = os.path.join(root, "template.html")
+        for latency_ms in LATENCIES_MS:
+            def slow_read(content_dir, rel_path):
+                time.sleep(latency_ms / 1000)
+                return read_source(content_dir, rel_path)
+
+            build.read_source = slow_read
+            baseline = None
+            for io_threads in (0, 1, 4, 8):
+                dest = os.path.join(root, f"public{latency_ms}-{io_threads}")
+                state = os.path.join(root, f"state{latency_ms}-{io_threads}.json")
+                start = time.perf_counter()
+                report = build.build_site(content, template, dest, state, io_threads=io_threads)
+                elapsed = time.perf_counter() - start
+                digest = tree_digest(dest)
+                if baseline is None:
+                    baseline = (elapsed, digest)
+                assert digest == baseline[1], "pipelined output differs from the inline build"
+                waited = "" if report["io"] is None else f", render waited {report['io']['read_queue']['get_wait']:.3f} s for reads"
+                print(f"latency {latency_ms}ms io_threads={io_threads}: {elapsed:7.3f} s, "
+                      f"speedup {baseline[0] / elapsed:.2f}x{waited}")
+    build.read_source = read_source
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import corpus
+from htmlnode import ParentNode
+from markdown_to_html_node import markdown_to_html_node
+
+EXCERPT_BLOCKS = 3
+REPEAT = 5
+
+
+def excerpt(documents, lazy):
+    # A listing page: the first few blocks of every document
+    return [ParentNode("div", markdown_to_html_node(document, lazy=lazy).children[:EXCERPT_BLOCKS]).to_html()
+            for document in documents]
+
+
+def best(func):
+    result = None
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        result = elapsed if result is None else min(result, elapsed)
+    return result
+
+
+def main():
+    documents = [markdown for _, markdown in corpus.generate(1.0)["prose"]]
+    assert excerpt(documents, True) == excerpt(documents, False)
+    eager = best(lambda: excerpt(documents, False))
+    lazy = best(lambda: excerpt(documents, True))
+    print(f"excerpt of {EXCERPT_BLOCKS} blocks from {len(documents)} documents")
+    print(f"eager {eager * 1000:8.2f} ms")
+    print(f"lazy  {lazy * 1000:8.2f} ms  ({eager / lazy:.1f}x)")
+    full_eager = best(lambda: [markdown_to_html_node(document).to_html() for document in documents])
+    full_lazy = best(lambda: [markdown_to_html_node(document, lazy=True).to_html() for document in documents])
+    print(f"whole documents: eager {full_eager * 1000:.2f} ms, lazy {full_lazy * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import corpus
+from markdown_to_html_node import markdown_to_html_node, write_markdown_mmap
+
+SIZES_MB = (8, 32, 128)
+
+
+def make_source(path, size_mb):
+    # The huge corpus document repeated until the file has the wanted size
+    document = corpus.generate(1.0, 1234)["huge"][0][1]
+    data = (document.strip() + "\n\n").encode("utf-8")
+    with open(path, "wb") as file:
+        for _ in range(size_mb * 1024 * 1024 // len(data) + 1):
+            file.write(data)
+
+
+def render(mode, path):
+    # Runs in a child process so every mode starts with a fresh peak RSS
+    start = time.perf_counter()
+    with open(os.devnull, "w", encoding="utf-8") as out:
+        if mode == "mmap":
+            write_markdown_mmap(path, out)
+        else:
+            with open(path, encoding="utf-8") as file:
+                markdown_to_html_node(file.read()).write_to(out)
+    elapsed = time.perf_counter() - start
+    # ru_maxrss is in KiB on Linux
+    print(f"{resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} {elapsed:.2f}")
+
+
+def main():
+    if len(sys.argv) == 3:
+        render(sys.argv[1], sys.argv[2])
+        return
+    with tempfile.TemporaryDirectory() as root:
+        for size_mb in SIZES_MB:
+            path = os.path.join(root, f"{size_mb}.md")
+            make_source(path, size_mb)
+            for mode in ("read", "mmap"):
+                output = subprocess.run([sys.executable, __file__, mode, path], capture_output=True, text=True, check=True)
+                rss, seconds = output.stdout.split()
+                print(f"{size_mb}MB {mode}: peak RSS {rss}MB, {seconds}s")
+
+
+if __name__ == "__main__":
+    main()
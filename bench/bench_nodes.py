@@ -0,0 +1,39 @@
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from htmlnode import LeafNode, ParentNode
+from textnode import TextNode, TextType, text_node_to_html_node
+
+COUNT = 100_000
+
+
+def measure(name, build):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    nodes = build()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    # The list holding the nodes is counted too, it is 8 bytes per node
+    print(f"{name:<26} {size / len(nodes):7.1f} bytes/node")
+    return nodes
+
+
+def main():
+    # Strings are created up front so only the node objects are measured
+    texts = [f"text {i}" for i in range(COUNT)]
+    text_nodes = [TextNode(text, TextType.BOLD) for text in texts]
+
+    measure("TextNode", lambda: [TextNode(text, TextType.TEXT) for text in texts])
+    measure("LeafNode (no props)", lambda: [LeafNode("b", text) for text in texts])
+    measure("LeafNode (link)", lambda: [LeafNode("a", text, {"href": text}) for text in texts])
+    measure("text_node_to_html_node", lambda: [text_node_to_html_node(node) for node in text_nodes])
+    leaves = [LeafNode("b", text) for text in texts]
+    measure("ParentNode", lambda: [ParentNode("p", [leaf]) for leaf in leaves])
+
+
+if __name__ == "__main__":
+    main()
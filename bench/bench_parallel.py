@@ -0,0 +1,62 @@
+import hashlib
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from build import build_site
+
+PAGES = 400
+TEMPLATE = "<html><head><title>{{ Title }}</title></head><body>{{ Content }}</body></html>"
+
+
+def make_site(root, pages):
+    # Deterministic pages with a long tail of sizes, like a real docs site
+    rng = random.Random(42)
+    content = os.path.join(root, "content")
+    for i in range(pages):
+        paragraphs = int(rng.paretovariate(1.2) * 10)
+        body = "\n\n".join(
+            f"Paragraph {p} with **bold**, _italic_, `code` and a [link](/page{p}.html)." for p in range(paragraphs)
+        )
+        path = os.path.join(content, f"section{i % 10}", f"page{i}.md")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(f"# Page {i}\n\n{body}\n")
+    with open(os.path.join(root, "template.html"), "w", encoding="utf-8") as file:
+        file.write(TEMPLATE)
+    return content
+
+
+def tree_digest(dest):
+    digest = hashlib.sha256()
+    for root, dirs, files in sorted(os.walk(dest)):
+        for name in sorted(files):
+            with open(os.path.join(root, name), "rb") as file:
+                digest.update(file.read())
+    return digest.hexdigest()
+
+
+def main():
+    with tempfile.TemporaryDirectory() as root:
+        content = make_site(root, PAGES)
+        template = os.path.join(root, "template.html")
+        baseline = None
+        for jobs in (1, 2, 4, 8):
+            dest = os.path.join(root, f"public{jobs}")
+            state = os.path.join(root, f"state{jobs}.json")
+            start = time.perf_counter()
+            build_site(content, template, dest, state, jobs=jobs)
+            elapsed = time.perf_counter() - start
+            digest = tree_digest(dest)
+            if baseline is None:
+                baseline = (elapsed, digest)
+            assert digest == baseline[1], "parallel output differs from the serial build"
+            print(f"jobs={jobs}: {elapsed:7.3f} s, speedup {baseline[0] / elapsed:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
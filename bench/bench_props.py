@@ -0,0 +1,42 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import corpus
+from markdown_to_html_node import markdown_to_html_node
+
+REPEAT = 15
+
+
+def best(func, setup):
+    # Best time of func(setup()), setup is not timed
+    result = None
+    for _ in range(REPEAT):
+        value = setup()
+        start = time.perf_counter()
+        func(value)
+        elapsed = time.perf_counter() - start
+        result = elapsed if result is None else min(result, elapsed)
+    return result
+
+
+def serialize(trees):
+    for tree in trees:
+        tree.to_html()
+
+
+def main():
+    documents = [markdown for _, markdown in corpus.generate(0.5)["links"]]
+    fresh = lambda: [markdown_to_html_node(document) for document in documents]
+    trees = fresh()
+    serialize(trees)
+
+    # A page and its feed entry serialize the same tree twice, the second time attributes come from the cache
+    print(f"to_html, fresh trees        {best(serialize, fresh) * 1000:7.2f} ms")
+    print(f"to_html, serialized before  {best(serialize, lambda: trees) * 1000:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
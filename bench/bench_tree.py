@@ -0,0 +1,45 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from htmlnode import LeafNode, ParentNode, walk
+
+DEPTH = 10_000
+WIDTH = 1_000_000
+
+
+def deep_tree(depth):
+    node = LeafNode("span", "leaf")
+    for _ in range(depth):
+        node = ParentNode("blockquote", [node])
+    return node
+
+
+def wide_tree(width):
+    return ParentNode("ul", [LeafNode("li", "item") for _ in range(width)])
+
+
+def timed(label, func):
+    start = time.perf_counter()
+    result = func()
+    print(f"{label:<34} {time.perf_counter() - start:8.3f} s")
+    return result
+
+
+def main():
+    print(f"recursion limit: {sys.getrecursionlimit()}")
+    deep = timed(f"build {DEPTH} levels deep", lambda: deep_tree(DEPTH))
+    html = timed(f"to_html {DEPTH} levels deep", deep.to_html)
+    assert html.startswith("<blockquote>" * 3) and html.endswith("</blockquote>" * 3)
+    timed(f"walk {DEPTH} levels deep", lambda: sum(1 for _ in walk(deep)))
+
+    wide = timed(f"build {WIDTH} nodes wide", lambda: wide_tree(WIDTH))
+    html = timed(f"to_html {WIDTH} nodes wide", wide.to_html)
+    assert len(html) == len("<ul></ul>") + WIDTH * len("<li>item</li>")
+    timed(f"walk {WIDTH} nodes wide", lambda: sum(1 for _ in walk(wide)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+import random
+
+# Deterministic synthetic markdown corpora. The same seed and scale always produce the same documents,
+# so timings from different runs and machines are comparable.
+
+WORDS = (
+    "static site generator markdown block inline parser node tree render page template build cache "
+    "content output the a of and to in is for with on that by this be are from or as at it"
+).split()
+
+
+def _sentence(rng, words=12):
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def _inline_sentence(rng):
+    # A sentence with every kind of inline markup
+    return (
+        f"{_sentence(rng, 5)} **{rng.choice(WORDS)} {rng.choice(WORDS)}** and _{rng.choice(WORDS)}_ "
+        f"with `{rng.choice(WORDS)}()` see [{rng.choice(WORDS)}](/docs/{rng.choice(WORDS)}.html) "
+        f"or ![{rng.choice(WORDS)}](/images/{rng.randrange(1000)}.png)."
+    )
+
+
+def prose_document(rng, paragraphs):
+    blocks = [f"# {_sentence(rng, 4)}"]
+    for i in range(paragraphs):
+        if i % 8 == 0:
+            blocks.append(f"## {_sentence(rng, 3)}")
+        lines = [_sentence(rng) if rng.random() < 0.8 else _inline_sentence(rng) for _ in range(4)]
+        blocks.append("\n".join(lines))
+    return "\n\n".join(blocks) + "\n"
+
+
+def link_document(rng, paragraphs):
+    blocks = [f"# {_sentence(rng, 4)}"]
+    for _ in range(paragraphs):
+        links = " ".join(
+            f"[{rng.choice(WORDS)} {rng.choice(WORDS)}](https://example.com/{rng.choice(WORDS)}/{rng.randrange(10000)})"
+            for _ in range(20)
+        )
+        blocks.append(f"{_sentence(rng, 4)} {links}")
+        blocks.append("\n".join(f"- [{rng.choice(WORDS)}](/page{rng.randrange(500)}.html)" for _ in range(10)))
+    return "\n\n".join(blocks) + "\n"
+
+
+def nested_document(rng, sections):
+    # The block parser has no nested blocks, so nesting here means many-level quote markers,
+    # long lists and long numbered lists: the deepest structures it accepts
+    blocks = [f"# {_sentence(rng, 4)}"]
+    for _ in range(sections):
+        depth = rng.randrange(1, 30)
+        blocks.append("\n".join(">" * depth + " " + _inline_sentence(rng) for _ in range(10)))
+        blocks.append("\n".join(f"- {_inline_sentence(rng)}" for _ in range(25)))
+        blocks.append("\n".join(f"{i + 1}. {_sentence(rng, 6)}" for i in range(25)))
+        blocks.append("```\n" + "\n".join(_sentence(rng) for _ in range(10)) + "\n```")
+    return "\n\n".join(blocks) + "\n"
+
+
+def generate(scale=1.0, seed=1234):
+    # name -> list of (relative path, markdown) pairs
+    rng = random.Random(seed)
+    count = lambda n: max(1, int(n * scale))
+    return {
+        "prose": [(f"prose/page{i}.md", prose_document(rng, 60)) for i in range(count(20))],
+        "links": [(f"links/page{i}.md", link_document(rng, 30)) for i in range(count(20))],
+        "nested": [(f"nested/page{i}.md", nested_document(rng, 10)) for i in range(count(10))],
+        "huge": [("huge/index.md", prose_document(rng, count(20000)))],
+        "small_files": [(f"small/page{i}.md", prose_document(rng, 2)) for i in range(count(2000))],
+    }
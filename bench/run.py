@@ -0,0 +1,156 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import corpus
+from build import build_site
+from inline_markdown import text_to_textnodes
+from markdown_blocks import BlockType, block_to_block_type, markdown_to_blocks
+from markdown_to_html_node import markdown_to_html_node
+from textnode import text_node_to_html_node
+
+STAGES = ("markdown_to_blocks", "block_to_block_type", "text_to_textnodes", "text_node_to_html_node", "to_html", "build")
+TEMPLATE = "<!doctype html><html><head><title>{{ Title }}</title></head><body>{{ Content }}</body></html>"
+
+
+def inline_texts(block, block_type):
+    # The inline text markdown_to_html_node hands to text_to_textnodes for a block
+    lines = block.split("\n")
+    if block_type == BlockType.HEADING:
+        return [block.split(" ", 1)[1].strip()]
+    if block_type == BlockType.CODE:
+        return []
+    if block_type == BlockType.QUOTE:
+        return [" ".join(line.lstrip(">").strip() for line in lines)]
+    if block_type == BlockType.UNORDERED_LIST:
+        return [line[2:] for line in lines]
+    if block_type == BlockType.ORDERED_LIST:
+        return [line.split(". ", 1)[1] for line in lines]
+    return [" ".join(lines)]
+
+
+def best_time(func, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def time_build(pages, repeat):
+    # Full cold build of the corpus: read, render, write
+    def build():
+        with tempfile.TemporaryDirectory() as root:
+            content = os.path.join(root, "content")
+            for rel_path, markdown in pages:
+                path = os.path.join(content, rel_path)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, "w", encoding="utf-8") as file:
+                    file.write(markdown)
+            template = os.path.join(root, "template.html")
+            with open(template, "w", encoding="utf-8") as file:
+                file.write(TEMPLATE)
+            start = time.perf_counter()
+            build_site(content, template, os.path.join(root, "public"), os.path.join(root, "state.json"))
+            return time.perf_counter() - start
+
+    return min(build() for _ in range(repeat))
+
+
+def run_corpus(pages, repeat):
+    documents = [markdown for _, markdown in pages]
+    results = {}
+
+    results["markdown_to_blocks"] = best_time(lambda: [markdown_to_blocks(doc) for doc in documents], repeat)
+    blocks = [block for doc in documents for block in markdown_to_blocks(doc)]
+
+    results["block_to_block_type"] = best_time(lambda: [block_to_block_type(block) for block in blocks], repeat)
+    texts = [text for block in blocks for text in inline_texts(block, block_to_block_type(block))]
+
+    results["text_to_textnodes"] = best_time(lambda: [text_to_textnodes(text) for text in texts], repeat)
+    text_nodes = [node for text in texts for node in text_to_textnodes(text)]
+
+    results["text_node_to_html_node"] = best_time(lambda: [text_node_to_html_node(node) for node in text_nodes], repeat)
+
+    trees = [markdown_to_html_node(doc) for doc in documents]
+    results["to_html"] = best_time(lambda: [tree.to_html() for tree in trees], repeat)
+
+    results["build"] = time_build(pages, repeat)
+    return results
+
+
+def compare(results, baseline, threshold, min_delta=0.0):
+    # Returns the (corpus, stage, baseline, current) entries that got slower than the threshold allows.
+    # Differences below min_delta seconds are treated as noise.
+    regressions = []
+    for name, stages in results["corpora"].items():
+        for stage, seconds in stages.items():
+            previous = baseline.get("corpora", {}).get(name, {}).get(stage)
+            if previous is not None and seconds > previous * (1 + threshold) and seconds - previous > min_delta:
+                regressions.append((name, stage, previous, seconds))
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark every stage of the markdown to HTML pipeline.")
+    parser.add_argument("--scale", type=float, default=1.0, help="corpus size multiplier")
+    parser.add_argument("--seed", type=int, default=1234, help="corpus generator seed")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per stage, the fastest one is kept")
+    parser.add_argument("--corpus", action="append", help="only run these corpora (repeatable)")
+    parser.add_argument("--output", help="write JSON results here instead of stdout")
+    parser.add_argument("--compare", help="baseline JSON file to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown against the baseline")
+    parser.add_argument("--min-delta", type=float, default=0.001, help="ignore slowdowns smaller than this many seconds")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    corpora = corpus.generate(args.scale, args.seed)
+    names = args.corpus or list(corpora)
+
+    results = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scale": args.scale,
+        "seed": args.seed,
+        "corpora": {},
+    }
+    for name in names:
+        results["corpora"][name] = run_corpus(corpora[name], args.repeat)
+        timings = ", ".join(f"{stage} {results['corpora'][name][stage] * 1000:.1f}ms" for stage in STAGES)
+        print(f"{name}: {timings}", file=sys.stderr)
+
+    output = json.dumps(results, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline, args.threshold, args.min_delta)
+        for name, stage, previous, seconds in regressions:
+            print(
+                f"REGRESSION {name}/{stage}: {previous * 1000:.1f}ms -> {seconds * 1000:.1f}ms "
+                f"(+{(seconds / previous - 1) * 100:.0f}%)",
+                file=sys.stderr,
+            )
+        if regressions:
+            return 1
+        print(f"No regressions over {args.threshold * 100:.0f}% against {args.compare}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
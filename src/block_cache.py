@@ -0,0 +1,135 @@
+import hashlib
+import os
+import sqlite3
+import time
+
+# Most SQLite builds allow at least 999 parameters per statement
+_BATCH = 500
+
+def block_key(block, *options):
+    # Cache key of a block's rendered HTML: the block text plus whatever else changes the output
+    key = hashlib.sha256()
+    for part in options:
+        key.update(str(part).encode("utf-8"))
+        key.update(b"\0")
+    key.update(block.encode("utf-8"))
+    return key.hexdigest()
+
+class BlockCache:
+    # Rendered HTML fragments on disk, shared by builds and by the worker processes of one build.
+    # SQLite in WAL mode lets readers run next to one writer, and busy writers wait instead of failing.
+    # Once the fragments take more than max_bytes the least recently used ones are deleted.
+    def __init__(self, path, max_bytes=64 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Bytes written since the last eviction check
+        self._added = 0
+        self._connection = None
+        self._pid = None
+
+    def _connect(self):
+        # SQLite connections can't cross a fork, so each process opens its own
+        if self._connection is not None and self._pid == os.getpid():
+            return self._connection
+        connection = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS blocks "
+            "(key TEXT PRIMARY KEY, html TEXT NOT NULL, size INTEGER NOT NULL, accessed INTEGER NOT NULL)"
+        )
+        connection.execute("CREATE INDEX IF NOT EXISTS blocks_accessed ON blocks (accessed)")
+        self._connection = connection
+        self._pid = os.getpid()
+        return connection
+
+    def get_many(self, keys):
+        # key -> html for the keys that are cached, marking them as just used
+        connection = self._connect()
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        for start in range(0, len(keys), _BATCH):
+            batch = keys[start:start + _BATCH]
+            placeholders = ",".join("?" * len(batch))
+            found.update(connection.execute(f"SELECT key, html FROM blocks WHERE key IN ({placeholders})", batch))
+        if found:
+            now = time.time_ns()
+            hit_keys = list(found)
+            for start in range(0, len(hit_keys), _BATCH):
+                batch = hit_keys[start:start + _BATCH]
+                placeholders = ",".join("?" * len(batch))
+                connection.execute(f"UPDATE blocks SET accessed = ? WHERE key IN ({placeholders})", [now, *batch])
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def get(self, key, default=None):
+        return self.get_many([key]).get(key, default)
+
+    def put_many(self, items):
+        # Stores (key, html) pairs in one transaction
+        rows = []
+        now = time.time_ns()
+        for key, html in items:
+            size = len(html.encode("utf-8"))
+            # Fragments bigger than the whole budget would only push everything else out
+            if size <= self.max_bytes:
+                rows.append((key, html, size, now))
+        if not rows:
+            return
+        connection = self._connect()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.executemany("INSERT OR REPLACE INTO blocks (key, html, size, accessed) VALUES (?, ?, ?, ?)", rows)
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        self._added += sum(row[2] for row in rows)
+        # Summing all sizes isn't free, so the budget is checked again only after an eighth of it was written
+        if self._added > self.max_bytes // 8:
+            self.evict()
+
+    def put(self, key, html):
+        self.put_many([(key, html)])
+
+    def evict(self):
+        # Deletes least recently used fragments until the cache is back under its budget, returns how many
+        self._added = 0
+        connection = self._connect()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM blocks").fetchone()[0]
+            removed = 0
+            if total > self.max_bytes:
+                excess = total - self.max_bytes
+                # Oldest first, up to and including the fragment that brings the total under the budget
+                removed = connection.execute(
+                    "DELETE FROM blocks WHERE key IN (SELECT key FROM "
+                    "(SELECT key, size, SUM(size) OVER (ORDER BY accessed, key) AS running FROM blocks) "
+                    "WHERE running - size < ?)",
+                    (excess,),
+                ).rowcount
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        self.evictions += removed
+        return removed
+
+    def clear(self):
+        self._connect().execute("DELETE FROM blocks")
+        self._added = 0
+
+    def stats(self):
+        entries, size = self._connect().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM blocks").fetchone()
+        return {"entries": entries, "bytes": size, "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+    def close(self):
+        if self._connection is not None and self._pid == os.getpid():
+            self._connection.close()
+        self._connection = None
+        self._pid = None
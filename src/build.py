@@ -0,0 +1,535 @@
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from markdown_to_html_node import apply_render_settings, markdown_to_html_node, render_cache_stats, render_settings
+from inline_markdown import extract_markdown_links
+from htmlnode import escape_text
+from dependency_graph import DependencyGraph, TEMPLATE, INCLUDE, LINK, resolve_link
+from template import Template, TemplateCache
+from static_sync import sync_static
+from compress import compress_outputs
+from pipeline import IOPipeline
+from manifest import update_manifest
+
+STATE_VERSION = 7
+
+# A block made of just {{> path }} is replaced by the contents of that file from the includes directory
+_INCLUDE_PATTERN = re.compile(r"^\{\{>\s*(\S+?)\s*\}\}[ \t]*$", re.MULTILINE)
+
+# A page starting with <!-- template: name --> is rendered with templates/name.html
+_TEMPLATE_NAME_PATTERN = re.compile(r"\A\s*<!--\s*template:\s*([\w-]+)\s*-->[ \t]*(?:\n|\Z)")
+
+# Compiled templates of this process (worker processes get their own)
+_templates = TemplateCache()
+
+def extract_title(markdown):
+    for line in markdown.split("\n"):
+        if line.startswith("# "):
+            return line[2:].strip()
+    raise ValueError("Page has no h1 header to use as its title")
+
+def expand_includes(markdown, includes_dir):
+    # Returns the expanded markdown and the included paths. Included files are not expanded again.
+    included = []
+
+    def replace(match):
+        rel_path = match.group(1)
+        try:
+            with open(os.path.join(includes_dir, rel_path), encoding="utf-8") as file:
+                text = file.read()
+        except FileNotFoundError:
+            raise ValueError(f"Included file not found: {rel_path}") from None
+        included.append(rel_path)
+        return text.strip()
+
+    return _INCLUDE_PATTERN.sub(replace, markdown), included
+
+def extract_template_name(markdown):
+    # Returns the template name chosen by the page (or None) and the markdown without that line
+    match = _TEMPLATE_NAME_PATTERN.match(markdown)
+    if match is None:
+        return None, markdown
+    return match.group(1), markdown[match.end():]
+
+def template_path_for(name, template_path, templates_dir):
+    if name is None:
+        return template_path
+    return os.path.join(templates_dir, name + ".html")
+
+def render_page(markdown, template, minify=False):
+    if isinstance(template, str):
+        template = Template(template, minify)
+    title = escape_text(extract_title(markdown))
+    content = markdown_to_html_node(markdown, minify).to_html(minify)
+    return template.render({"Title": title, "Content": content})
+
+def render_source(markdown, template_path, templates_dir, includes_dir, minify=False):
+    # Renders one page and reports what it depends on: (html, title, template path, includes, link urls)
+    name, markdown = extract_template_name(markdown)
+    template_path = template_path_for(name, template_path, templates_dir)
+    markdown, includes = expand_includes(markdown, includes_dir)
+    html = render_page(markdown, _templates.get(template_path, minify), minify)
+    links = [url for _, url in extract_markdown_links(markdown)]
+    return html, extract_title(markdown), template_path, includes, links
+
+def read_source(content_dir, rel_path):
+    with open(os.path.join(content_dir, rel_path), "rb") as file:
+        return file.read(), os.fstat(file.fileno())
+
+def render_file(content_dir, rel_path, template_path, templates_dir, includes_dir, data=None, minify=False, stat=None):
+    # Renders one source file: (source hash, html bytes, size, mtime_ns, title, template path, includes, link urls)
+    if data is None:
+        data, stat = read_source(content_dir, rel_path)
+    elif stat is None:
+        stat = os.stat(os.path.join(content_dir, rel_path))
+    html, title, template_path, includes, links = render_source(
+        data.decode("utf-8"), template_path, templates_dir, includes_dir, minify
+    )
+    return hash_bytes(data), html.encode("utf-8"), stat.st_size, stat.st_mtime_ns, title, template_path, includes, links
+
+def _render_chunk(content_dir, rel_paths, template_path, templates_dir, includes_dir, minify=False):
+    # Runs in a worker process, one chunk of pages per task to keep scheduling overhead low.
+    # Also returns how the worker's render cache counters moved, the parent process only sees its own.
+    before = render_cache_stats()
+    pages = [
+        (rel_path, render_file(content_dir, rel_path, template_path, templates_dir, includes_dir, None, minify))
+        for rel_path in rel_paths
+    ]
+    return pages, cache_stats_delta(before, render_cache_stats())
+
+def cache_stats_delta(before, after):
+    if after is None:
+        return None
+    before = before or {}
+    return {
+        name: {key: value - before.get(name, {}).get(key, 0) for key, value in stats.items()}
+        for name, stats in after.items()
+    }
+
+def add_cache_stats(total, delta):
+    # Adds the counters of delta into total ({cache name: stats}) and returns it
+    if delta is None:
+        return total
+    total = total or {}
+    for name, stats in delta.items():
+        target = total.setdefault(name, dict.fromkeys(stats, 0))
+        for key, value in stats.items():
+            target[key] += value
+    return total
+
+def chunk_by_size(sizes, jobs):
+    # Groups pages into chunks of roughly equal total size, biggest chunks first.
+    # Pages bigger than a chunk get a chunk of their own, so large pages start early
+    # and the small ones fill in the gaps instead of straggling at the end.
+    if not sizes:
+        return []
+    target = max(1, sum(sizes.values()) // (jobs * 4))
+    chunks = []
+    current = []
+    current_size = 0
+    for rel_path in sorted(sizes, key=lambda path: (-sizes[path], path)):
+        if sizes[rel_path] >= target:
+            chunks.append([rel_path])
+            continue
+        current.append(rel_path)
+        current_size += sizes[rel_path]
+        if current_size >= target:
+            chunks.append(current)
+            current = []
+            current_size = 0
+    if current:
+        chunks.append(current)
+    return chunks
+
+def hash_bytes(data):
+    return hashlib.sha256(data).hexdigest()
+
+def find_markdown_files(content_dir):
+    # Relative paths of every markdown file ("/" separated), sorted so builds are deterministic
+    paths = []
+    for root, dirs, files in os.walk(content_dir):
+        for name in files:
+            if name.endswith(".md"):
+                rel_path = os.path.relpath(os.path.join(root, name), content_dir)
+                paths.append(rel_path.replace(os.sep, "/"))
+    return sorted(paths)
+
+def output_rel_path(rel_path):
+    return rel_path[:-len(".md")] + ".html"
+
+def output_path(dest_dir, rel_path):
+    return os.path.join(dest_dir, output_rel_path(rel_path))
+
+def write_file(path, data):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "wb") as file:
+        file.write(data)
+
+def write_if_changed(path, data, entry=None):
+    # Leaves path alone when it already holds data, so unchanged outputs keep their mtime and deploys syncing by
+    # mtime skip them. entry is the {"hash", "size", "mtime_ns"} recorded when path was last written; while the
+    # file's stat still matches it the file isn't read. Returns (written, entry for the file now on disk).
+    digest = hash_bytes(data)
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        stat = None
+    if stat is not None and stat.st_size == len(data):
+        if entry is not None and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            same = entry["hash"] == digest
+        else:
+            with open(path, "rb") as file:
+                same = file.read() == data
+        if same:
+            return False, {"hash": digest, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    write_file(path, data)
+    stat = os.stat(path)
+    return True, {"hash": digest, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+class SiteBuilder:
+    def __init__(self, content_dir, template_path, dest_dir, state_path, static_dir=None, includes_dir="includes", jobs=1,
+                 templates_dir="templates", tracer=None, hardlink_static=False, checksum_static=False,
+                 gzip_level=None, gzip_min_size=256, minify=False, io_threads=4, read_depth=32, write_depth=64,
+                 manifest_path=None, mp_context=None):
+        self.content_dir = content_dir
+        self.template_path = template_path
+        self.templates_dir = templates_dir
+        self.dest_dir = dest_dir
+        self.state_path = state_path
+        self.static_dir = static_dir
+        self.includes_dir = includes_dir
+        self.hardlink_static = hardlink_static
+        self.checksum_static = checksum_static
+        # gzip level for .gz sidecars next to every output file, None to not write any
+        self.gzip_level = gzip_level
+        self.gzip_min_size = gzip_min_size
+        self.minify = minify
+        self.jobs = jobs
+        # Threads reading sources ahead of rendering, and how many read and rendered pages may wait in the
+        # pipeline's queues. With io_threads=0 pages are read and written by the rendering thread.
+        self.io_threads = io_threads
+        self.read_depth = read_depth
+        self.write_depth = write_depth
+        self.io = None
+        # Where to write the manifest of dest_dir and its diff against the previous build, None for no manifest
+        self.manifest_path = manifest_path
+        # Outputs whose bytes changed in the current build
+        self.written = []
+        # An installed instrument.Tracer; pages are then rendered serially so every stage is timed in this process
+        self.tracer = tracer
+        # multiprocessing context of the worker processes, None for the platform's default start method
+        self.mp_context = mp_context
+        self.executor = None
+        # Render cache counters of the worker processes over the current build
+        self.worker_cache_stats = None
+        self.state = self.load_state()
+        self.graph = DependencyGraph.from_dict(self.state["graph"])
+
+    def load_state(self):
+        try:
+            with open(self.state_path, encoding="utf-8") as file:
+                state = json.load(file)
+        except (FileNotFoundError, ValueError):
+            state = None
+        # Unreadable or outdated state just means a full rebuild
+        if not isinstance(state, dict) or state.get("version") != STATE_VERSION:
+            state = {"version": STATE_VERSION, "templates": {}, "pages": {}, "includes": {}, "graph": {}, "static": [], "compressed": {},
+                     "options": {}, "outputs": {}}
+        return state
+
+    def save_state(self):
+        self.state["graph"] = self.graph.to_dict()
+        # Writing to a temporary file first so an interrupted build never leaves half a state file
+        temp_path = self.state_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(self.state, file, indent=1, sort_keys=True)
+        os.replace(temp_path, self.state_path)
+
+    def file_changed(self, path, entry):
+        # Returns (changed, data, stat); data is only read when the stat doesn't match the entry
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return True, None, None
+        if entry is not None and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            return False, None, stat
+        with open(path, "rb") as file:
+            data = file.read()
+        if entry is not None and hash_bytes(data) == entry["hash"]:
+            # Touched but identical content: only the recorded stat needs updating
+            entry["size"] = stat.st_size
+            entry["mtime_ns"] = stat.st_mtime_ns
+            return False, data, stat
+        return True, data, stat
+
+    def changed_includes(self):
+        changed = set()
+        for rel_path in self.graph.targets(INCLUDE):
+            entry = self.state["includes"].get(rel_path)
+            if self.file_changed(os.path.join(self.includes_dir, rel_path), entry)[0]:
+                changed.add(rel_path)
+        return changed
+
+    def changed_templates(self):
+        # Templates whose content differs from the last build; a missing template counts as changed
+        changed = set()
+        for path in set(self.graph.targets(TEMPLATE)) | {self.template_path}:
+            try:
+                template_hash = _templates.get(path, self.minify).hash
+            except FileNotFoundError:
+                template_hash = None
+            if template_hash != self.state["templates"].get(path):
+                changed.add(path)
+        return changed
+
+    def record_include(self, rel_path):
+        path = os.path.join(self.includes_dir, rel_path)
+        with open(path, "rb") as file:
+            data = file.read()
+        stat = os.stat(path)
+        self.state["includes"][rel_path] = {"hash": hash_bytes(data), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    def build(self):
+        report = {"built": [], "skipped": [], "removed": [], "static": 0, "static_sync": None, "gzip": None, "io": None,
+                  "written": [], "manifest": None, "reasons": {}}
+        self.written = report["written"]
+        self.worker_cache_stats = None
+        reasons = report["reasons"]
+
+        pages = self.state["pages"]
+        sources = find_markdown_files(self.content_dir)
+        source_set = set(sources)
+        changed_templates = self.changed_templates()
+        changed_includes = self.changed_includes()
+        # Options that change every page's output, switching them rebuilds everything
+        options = {"minify": self.minify}
+        options_changed = self.state["options"] != options
+        self.state["options"] = options
+        # Changed includes get recorded again when the pages using them are rendered
+        for include in changed_includes:
+            self.state["includes"].pop(include, None)
+        page_data = {}
+
+        # Pages that changed themselves or whose template or includes changed
+        for rel_path in sources:
+            entry = pages.get(rel_path)
+            page_reasons = []
+            if entry is None:
+                page_reasons.append("new page")
+            else:
+                changed, data, _ = self.file_changed(os.path.join(self.content_dir, rel_path), entry)
+                if data is not None:
+                    page_data[rel_path] = data
+                if changed:
+                    page_reasons.append("source changed")
+                if not os.path.exists(output_path(self.dest_dir, rel_path)):
+                    page_reasons.append("output missing")
+                if options_changed:
+                    page_reasons.append("render options changed")
+                for template_path in self.graph.dependencies(rel_path, TEMPLATE):
+                    if template_path in changed_templates:
+                        page_reasons.append(f"template {template_path} changed")
+                for include in self.graph.dependencies(rel_path, INCLUDE):
+                    if include in changed_includes:
+                        page_reasons.append(f"include {include} changed")
+            if page_reasons:
+                reasons[rel_path] = page_reasons
+
+        # Removing pages whose source file is gone
+        changed_titles = {}
+        for rel_path in sorted(set(pages) - source_set):
+            target_path = output_path(self.dest_dir, rel_path)
+            if os.path.exists(target_path):
+                os.remove(target_path)
+            self.state["outputs"].pop(output_rel_path(rel_path), None)
+            del pages[rel_path]
+            self.graph.remove_page(rel_path)
+            changed_titles[rel_path] = "was removed"
+            report["removed"].append(rel_path)
+
+        # Rendering, then following links back from pages whose title changed
+        pending = sorted(reasons)
+        if self.io_threads > 0:
+            self.io = IOPipeline(self.io_threads, self.read_depth, self.write_depth, write_file=self.write_output)
+        try:
+            while pending or changed_titles:
+                for rel_path, result in self.render_pages(pending, page_data):
+                    change = self.record(rel_path, result, source_set)
+                    if change is not None:
+                        changed_titles[rel_path] = change
+                    report["built"].append(rel_path)
+
+                pending = []
+                for target in sorted(changed_titles):
+                    for page in self.graph.dependents(target, LINK):
+                        if page in source_set and page not in reasons:
+                            reasons[page] = []
+                            pending.append(page)
+                        if page in pending:
+                            reasons[page].append(f"linked page {target} {changed_titles[target]}")
+                changed_titles = {}
+        finally:
+            # Every page is on disk before static files are synced and outputs compressed
+            if self.io is not None:
+                io, self.io = self.io, None
+                for rel_output, result in io.flush():
+                    self.record_output(rel_output, result)
+                report["io"] = io.stats()
+        report["written"].sort()
+
+        report["built"].sort()
+        report["skipped"] = [rel_path for rel_path in sources if rel_path not in reasons]
+
+        # Keeping include entries only for files that are still included somewhere
+        included = set(self.graph.targets(INCLUDE))
+        self.state["includes"] = {path: entry for path, entry in self.state["includes"].items() if path in included}
+        self.state["templates"] = {path: _templates.get(path, self.minify).hash for path in self.graph.targets(TEMPLATE)}
+
+        pages_output = [output_rel_path(rel_path) for rel_path in sources]
+        if self.static_dir is not None:
+            # Static files synced last time that are gone get deleted, unless a page now writes that path
+            sync = sync_static(
+                self.static_dir, self.dest_dir, self.state["static"], pages_output, self.hardlink_static, self.checksum_static
+            )
+            self.state["static"] = sync.pop("files")
+            report["static"] = sync["copied"] + sync["linked"]
+            report["static_sync"] = sync
+
+        if self.gzip_level is not None:
+            outputs = sorted(set(pages_output) | set(self.state["static"]))
+            changed = list(report["written"])
+            if report["static_sync"] is not None:
+                changed += report["static_sync"]["updated"]
+            self.state["compressed"], report["gzip"] = compress_outputs(
+                self.dest_dir, outputs, self.state["compressed"], changed, self.gzip_level, self.gzip_min_size
+            )
+        elif self.state["compressed"]:
+            # Sidecars left by an earlier build would go stale, so they go too
+            self.state["compressed"], report["gzip"] = compress_outputs(self.dest_dir, [], self.state["compressed"])
+        if self.manifest_path is not None:
+            report["manifest"] = update_manifest(self.manifest_path, self.dest_dir, self.state["outputs"])
+        self.save_state()
+
+        # Cache counters of this process and its workers, None unless a render cache was enabled
+        cache = render_cache_stats()
+        workers = self.worker_cache_stats
+        if cache is not None and workers is not None and "disk" in workers:
+            # Every process shares the one disk cache file, whose size this process's stats already count
+            workers["disk"]["entries"] = workers["disk"]["bytes"] = 0
+        report["cache"] = add_cache_stats(cache, workers)
+        return report
+
+    def render_pages(self, rel_paths, page_data):
+        # Yields (rel_path, result) pairs, in a process pool when more than one job was asked for
+        if self.tracer is not None:
+            for rel_path in rel_paths:
+                data = page_data.pop(rel_path, None)
+                with self.tracer.page(rel_path):
+                    result = render_file(
+                        self.content_dir, rel_path, self.template_path, self.templates_dir, self.includes_dir, data,
+                        self.minify
+                    )
+                yield rel_path, result
+            return
+
+        if (self.jobs <= 1 or len(rel_paths) <= 1) and self.io is not None:
+            # Sources already read while checking for changes aren't read again
+            known = {rel_path: page_data.pop(rel_path) for rel_path in rel_paths if rel_path in page_data}
+
+            def load(rel_path):
+                data = known.get(rel_path)
+                if data is None:
+                    return read_source(self.content_dir, rel_path)
+                return data, os.stat(os.path.join(self.content_dir, rel_path))
+
+            for rel_path, (data, stat) in self.io.prefetch(rel_paths, load):
+                yield rel_path, render_file(
+                    self.content_dir, rel_path, self.template_path, self.templates_dir, self.includes_dir, data,
+                    self.minify, stat
+                )
+            return
+
+        if self.jobs <= 1 or len(rel_paths) <= 1:
+            for rel_path in rel_paths:
+                data = page_data.pop(rel_path, None)
+                yield rel_path, render_file(
+                    self.content_dir, rel_path, self.template_path, self.templates_dir, self.includes_dir, data,
+                    self.minify
+                )
+            return
+
+        if self.executor is None:
+            # Workers get this process's caches and render options, spawned ones start without any
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.jobs, mp_context=self.mp_context, initializer=apply_render_settings,
+                initargs=(render_settings(),)
+            )
+        sizes = {rel_path: os.path.getsize(os.path.join(self.content_dir, rel_path)) for rel_path in rel_paths}
+        futures = [
+            self.executor.submit(
+                _render_chunk, self.content_dir, chunk, self.template_path, self.templates_dir, self.includes_dir,
+                self.minify
+            )
+            for chunk in chunk_by_size(sizes, self.jobs)
+        ]
+        for future in as_completed(futures):
+            pages, cache_stats = future.result()
+            self.worker_cache_stats = add_cache_stats(self.worker_cache_stats, cache_stats)
+            yield from pages
+
+    def record(self, rel_path, result, source_set):
+        # Writes a rendered page and records its dependencies.
+        # Returns how the page changed for pages linking to it, or None if its title is the same.
+        source_hash, html, size, mtime_ns, title, template_path, includes, links = result
+        if self.io is not None:
+            self.io.write(output_rel_path(rel_path), html)
+        else:
+            self.record_output(output_rel_path(rel_path), self.write_output(output_rel_path(rel_path), html))
+
+        self.graph.set_dependencies(rel_path, TEMPLATE, [template_path])
+        self.graph.set_dependencies(rel_path, INCLUDE, includes)
+        linked = (resolve_link(rel_path, url, source_set) for url in links)
+        self.graph.set_dependencies(rel_path, LINK, [page for page in linked if page is not None and page != rel_path])
+        for include in includes:
+            if include not in self.state["includes"]:
+                self.record_include(include)
+
+        previous = self.state["pages"].get(rel_path)
+        self.state["pages"][rel_path] = {"hash": source_hash, "size": size, "mtime_ns": mtime_ns, "title": title}
+        if previous is None:
+            return "was added"
+        if previous.get("title") != title:
+            return "title changed"
+        return None
+
+    def write_output(self, rel_output, data):
+        # Runs on the I/O pipeline's writer thread, which only reads the recorded entries
+        return write_if_changed(os.path.join(self.dest_dir, rel_output), data, self.state["outputs"].get(rel_output))
+
+    def record_output(self, rel_output, result):
+        written, entry = result
+        self.state["outputs"][rel_output] = entry
+        if written:
+            self.written.append(rel_output)
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+def build_site(content_dir, template_path, dest_dir, state_path, static_dir=None, includes_dir="includes", jobs=1,
+               templates_dir="templates", tracer=None, hardlink_static=False, checksum_static=False,
+               gzip_level=None, gzip_min_size=256, minify=False, io_threads=4, read_depth=32, write_depth=64,
+               manifest_path=None):
+    builder = SiteBuilder(
+        content_dir, template_path, dest_dir, state_path, static_dir, includes_dir, jobs, templates_dir, tracer,
+        hardlink_static, checksum_static, gzip_level, gzip_min_size, minify, io_threads, read_depth, write_depth,
+        manifest_path
+    )
+    try:
+        return builder.build()
+    finally:
+        builder.close()
@@ -0,0 +1,86 @@
+import gzip
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+SUFFIX = ".gz"
+
+def sidecar_path(path):
+    return path + SUFFIX
+
+def write_sidecar(path, data):
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as file:
+        file.write(data)
+    os.replace(temp_path, path)
+
+def remove_sidecar(path):
+    try:
+        os.remove(sidecar_path(path))
+    except FileNotFoundError:
+        pass
+
+def compress_file(path, entry, level, min_size):
+    # Returns (entry, (size, compressed size)) or (entry, None) when nothing was written. The entry records the hash of the bytes the sidecar was made from
+    # and whether a sidecar was worth writing, so unchanged files are never compressed twice.
+    with open(path, "rb") as file:
+        data = file.read()
+    digest = hashlib.sha256(data).hexdigest()
+    if entry is not None and entry["hash"] == digest and entry["level"] == level:
+        if not entry["gz"] or os.path.exists(sidecar_path(path)):
+            return entry, None
+    compressed = None
+    if len(data) >= min_size:
+        # mtime=0 keeps the output identical for identical input
+        compressed = gzip.compress(data, level, mtime=0)
+        if len(compressed) >= len(data):
+            compressed = None
+    if compressed is None:
+        remove_sidecar(path)
+        return {"hash": digest, "level": level, "gz": False}, None
+    write_sidecar(sidecar_path(path), compressed)
+    return {"hash": digest, "level": level, "gz": True}, (len(data), len(compressed))
+
+def compress_outputs(dest_dir, rel_paths, entries, changed=(), level=9, min_size=256, workers=None):
+    # Writes a .gz next to each of rel_paths in dest_dir and returns (entries, report).
+    # Files not in changed that already have an entry are trusted to be up to date as long as their sidecar exists;
+    # sidecars of files no longer in rel_paths are deleted.
+    report = {"compressed": 0, "unchanged": 0, "not_worth_it": 0, "removed": 0, "bytes_in": 0, "bytes_out": 0}
+    changed = set(changed)
+    new_entries = {}
+    pending = []
+    for rel_path in rel_paths:
+        if rel_path.endswith(SUFFIX):
+            continue
+        entry = entries.get(rel_path)
+        path = os.path.join(dest_dir, rel_path)
+        if (rel_path not in changed and entry is not None and entry["level"] == level
+                and (not entry["gz"] or os.path.exists(sidecar_path(path)))):
+            new_entries[rel_path] = entry
+            report["unchanged"] += 1
+        else:
+            pending.append(rel_path)
+
+    # zlib releases the GIL, so threads compress in parallel
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            (rel_path, executor.submit(compress_file, os.path.join(dest_dir, rel_path), entries.get(rel_path), level, min_size))
+            for rel_path in pending
+        ]
+        for rel_path, future in futures:
+            entry, sizes = future.result()
+            new_entries[rel_path] = entry
+            if sizes is not None:
+                report["compressed"] += 1
+                report["bytes_in"] += sizes[0]
+                report["bytes_out"] += sizes[1]
+            elif entry is entries.get(rel_path):
+                report["unchanged"] += 1
+            else:
+                report["not_worth_it"] += 1
+
+    for rel_path in sorted(set(entries) - set(new_entries)):
+        if entries[rel_path]["gz"]:
+            remove_sidecar(os.path.join(dest_dir, rel_path))
+            report["removed"] += 1
+    return new_entries, report
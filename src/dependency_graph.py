@@ -0,0 +1,75 @@
+import posixpath
+
+TEMPLATE = "template"
+INCLUDE = "include"
+LINK = "link"
+
+class DependencyGraph:
+    def __init__(self, edges=None):
+        # page -> {kind: sorted list of things the page depends on}
+        self.edges = edges if edges is not None else {}
+        self._reverse = None
+
+    def set_dependencies(self, page, kind, targets):
+        self.edges.setdefault(page, {})[kind] = sorted(set(targets))
+        self._reverse = None
+
+    def dependencies(self, page, kind):
+        return self.edges.get(page, {}).get(kind, [])
+
+    def remove_page(self, page):
+        if self.edges.pop(page, None) is not None:
+            self._reverse = None
+
+    def dependents(self, target, kind):
+        # Pages depending on target, the reverse index is rebuilt lazily after changes
+        if self._reverse is None:
+            reverse = {}
+            for page, kinds in self.edges.items():
+                for edge_kind, targets in kinds.items():
+                    for edge_target in targets:
+                        reverse.setdefault((edge_kind, edge_target), set()).add(page)
+            self._reverse = reverse
+        return sorted(self._reverse.get((kind, target), ()))
+
+    def targets(self, kind):
+        found = set()
+        for kinds in self.edges.values():
+            found.update(kinds.get(kind, ()))
+        return sorted(found)
+
+    def to_dict(self):
+        return self.edges
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls({page: dict(kinds) for page, kinds in data.items()})
+
+def resolve_link(page, url, pages):
+    # Maps a link url found in page to the content page it points at, or None for external links.
+    # Paths are matched against the relative .md paths in pages, e.g. "/blog/post.html" -> "blog/post.md".
+    # Links to pages that don't exist yet still resolve, so adding that page later rebuilds the linker.
+    if not url or "://" in url or url.startswith(("mailto:", "#")):
+        return None
+    path = url.split("#", 1)[0].split("?", 1)[0]
+    if not path:
+        return None
+
+    if path.startswith("/"):
+        path = posixpath.normpath(path.lstrip("/") or ".")
+    else:
+        path = posixpath.normpath(posixpath.join(posixpath.dirname(page), path))
+    if path == ".":
+        path = ""
+
+    if path.endswith(".html"):
+        candidates = [path[:-len(".html")] + ".md"]
+    elif path.endswith(".md"):
+        candidates = [path]
+    else:
+        candidates = [path + ".md", posixpath.join(path, "index.md")]
+
+    for candidate in candidates:
+        if candidate in pages:
+            return candidate
+    return candidates[0]
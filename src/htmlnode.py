@@ -1,48 +1,365 @@
+import html
+import re
+import sys
+from types import MappingProxyType
+
+# Shared read-only defaults, so nodes without children or props don't each allocate their own.
+# The children and props properties swap in a node's own list or Props the first time they are asked for.
+_NO_CHILDREN = ()
+_NO_PROPS = MappingProxyType({})
+
+# Minified output: whitespace runs become one space except inside these elements, where whitespace is content
+WHITESPACE_TAGS = frozenset({"pre", "code", "textarea", "script", "style"})
+# Only runs and non-space whitespace, single spaces are already minimal and are left alone
+_WHITESPACE_PATTERN = re.compile(r"\s{2,}|[^\S ]")
+# Attribute values that stay unambiguous without quotes
+_UNQUOTED_VALUE_PATTERN = re.compile(r"[^\s\"'=<>`]+")
+
+# Most text has nothing to escape and is passed through as the same string object.
+# A few substring scans are several times cheaper than a regex search call for that check.
+# A lone ">" is harmless in text, so only "&" and "<" send text through html.escape.
+def escape_text(text):
+    if "&" in text or "<" in text:
+        return html.escape(text, quote=False)
+    return text
+
+# Values are written in double quotes, or unquoted when they have no quotes at all (see format_attribute),
+# so "&" and '"' are the only characters that need escaping
+def escape_attribute(value):
+    if value.__class__ is not str:
+        value = str(value)
+    if "&" in value or '"' in value:
+        return html.escape(value)
+    return value
+
+# Attribute names rendered once, interned so every page shares the same prefix strings
+_COMMON_ATTRIBUTES = ("href", "src", "alt", "title", "class", "id", "width", "height", "rel", "target", "lang")
+_QUOTED_PREFIXES = {name: sys.intern(f'{name}="') for name in _COMMON_ATTRIBUTES}
+_UNQUOTED_PREFIXES = {name: sys.intern(f"{name}=") for name in _COMMON_ATTRIBUTES}
+
+def collapse_whitespace(text):
+    return _WHITESPACE_PATTERN.sub(" ", text)
+
+def format_attribute(key, value, minify=False):
+    # Values like numbers are rendered as their text, common attribute names use their interned prefix
+    value = escape_attribute(value)
+    if minify and _UNQUOTED_VALUE_PATTERN.fullmatch(value):
+        return (_UNQUOTED_PREFIXES.get(key) or f"{key}=") + value
+    return (_QUOTED_PREFIXES.get(key) or f'{key}="') + value + '"'
+
+class Props(dict):
+    # Attributes of a node, remembering their rendered HTML until they change
+    __slots__ = ("_html", "_minified_html")
+
+    def to_html(self, minify=False):
+        # The slots are unset when Props was created directly rather than through a node
+        rendered = getattr(self, "_minified_html" if minify else "_html", None)
+        if rendered is None:
+            # Nodes have one or two attributes, concatenating beats building a list to join
+            rendered = ""
+            for key, value in self.items():
+                rendered += " " + format_attribute(key, value, minify)
+            if minify:
+                self._minified_html = rendered
+            else:
+                self._html = rendered
+        return rendered
+
+    def copy(self):
+        # The copy keeps the rendered HTML, the attributes are the same
+        props = Props(self)
+        props._html = getattr(self, "_html", None)
+        props._minified_html = getattr(self, "_minified_html", None)
+        return props
+
+    def _changed(self):
+        self._html = self._minified_html = None
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._changed()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._changed()
+
+    def __ior__(self, other):
+        super().__ior__(other)
+        self._changed()
+        return self
+
+    def clear(self):
+        super().clear()
+        self._changed()
+
+    def pop(self, *args):
+        value = super().pop(*args)
+        self._changed()
+        return value
+
+    def popitem(self):
+        item = super().popitem()
+        self._changed()
+        return item
+
+    def setdefault(self, key, default=None):
+        value = super().setdefault(key, default)
+        self._changed()
+        return value
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._changed()
+
+def _new_props(props=()):
+    props = Props(props)
+    # Filling the slots now is cheaper than the getattr fallback in to_html
+    props._html = props._minified_html = None
+    return props
+
+def _as_props(props):
+    # Every mapping is copied, so the node sees its own attributes change and nobody else's.
+    # Copies of Props keep their rendered HTML.
+    if props is None or not props:
+        return _NO_PROPS
+    if type(props) is Props:
+        return props.copy()
+    return _new_props(props)
+
 class HTMLNode:
+    __slots__ = ("tag", "value", "_children", "_props")
+
     def __init__(self, tag=None, value=None, children=None, props=None):
         self.tag = tag
         self.value = value
-        self.children = children if children is not None else []
-        self.props = props if props is not None else {}
+        self._children = children if children is not None else _NO_CHILDREN
+        self._props = _as_props(props)
+
+    @property
+    def children(self):
+        children = self._children
+        if children is _NO_CHILDREN:
+            children = self._children = []
+        return children
+
+    @children.setter
+    def children(self, children):
+        self._children = children
+
+    @property
+    def props(self):
+        props = self._props
+        if props is _NO_PROPS:
+            props = self._props = _new_props()
+        return props
 
-    def to_html(self):
+    @props.setter
+    def props(self, props):
+        self._props = _as_props(props)
+
+    def to_html(self, minify=False):
+        raise NotImplementedError()
+
+    def iter_html(self, minify=False):
         raise NotImplementedError()
+
+    def write_to(self, fp, minify=False):
+        # Streaming the HTML chunk by chunk instead of building the whole page string
+        for chunk in self.iter_html(minify):
+            fp.write(chunk)
     
-    def props_to_html(self):
-        key_value_list = []
-        for key in self.props:
-            current_result = (f'{key}="{self.props[key]}"')
-            key_value_list.append(current_result)
-        result = " " + " ".join(key_value_list) if key_value_list else ""
-        return result
+    def props_to_html(self, minify=False):
+        # Rendered once per Props and reused until they change
+        props = self._props
+        if not props:
+            return ""
+        return props.to_html(minify)
 
     def __repr__(self):
-        return f"HTMLNode({self.tag}, {self.value}, {self.children}, {self.props})"
+        return f"HTMLNode({self.tag}, {self.value}, {list(self._children)}, {dict(self._props)})"
     
 class LeafNode(HTMLNode):
+    # The escaped value and the value it was escaped from, so rendering again doesn't escape again
+    __slots__ = ("_escaped", "_escaped_from")
+
     def __init__(self, tag, value, props=None):
-        super().__init__(tag, value, children=[], props=props)
-        self.children = []
+        # Setting the slots directly, leaf nodes are created for every inline span
+        self.tag = tag
+        self.value = value
+        self._children = _NO_CHILDREN
+        self._props = _NO_PROPS if props is None else _as_props(props)
+        self._escaped_from = None
 
-    def to_html(self):
-        if self.value is None:
-            raise ValueError("Leaf nodes must have a value")
-        if self.tag is None:
-            return self.value
-        else:
-            return (f"<{self.tag}{self.props_to_html()}>{self.value}</{self.tag}>")
+    def to_html(self, minify=False):
+        # The one place leaves are rendered, ParentNode.iter_html calls it for every leaf.
+        # escape_text and props_to_html are inlined, the substring scans raise TypeError for non-strings.
+        value = self.value
+        try:
+            if "&" in value or "<" in value:
+                value = self._escape(value)
+        except TypeError:
+            if value is None:
+                raise ValueError("Leaf nodes must have a value")
+            value = escape_text(str(value))
+        tag = self.tag
+        if minify and tag not in WHITESPACE_TAGS:
+            value = collapse_whitespace(value)
+        if tag is None:
+            return value
+        props = self._props
+        return f"<{tag}{props.to_html(minify) if props else ''}>{value}</{tag}>"
+
+    def _escape(self, value):
+        # Only text that needs escaping gets here, the result is kept until the value changes
+        if self._escaped_from is not value:
+            self._escaped_from = value
+            self._escaped = html.escape(value, quote=False)
+        return self._escaped
+
+    def iter_html(self, minify=False):
+        yield self.to_html(minify)
         
+class RawNode(HTMLNode):
+    # HTML that was rendered before (e.g. taken from a cache), written out as is: not escaped, not minified again
+    __slots__ = ()
+
+    def __init__(self, html):
+        self.tag = None
+        self.value = html
+        self._children = _NO_CHILDREN
+        self._props = _NO_PROPS
+
+    def to_html(self, minify=False):
+        return self.value
+
+    def iter_html(self, minify=False):
+        yield self.value
+
 class ParentNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag, children, props=None):
         super().__init__(tag, value=None, children=children, props=props)
 
-    def to_html(self):
+    def to_html(self, minify=False):
+        return "".join(self.iter_html(minify))
+
+    def iter_html(self, minify=False):
+        if minify:
+            yield from self._iter_minified_html()
+            return
+        # Same explicit-stack traversal as walk(), inlined here because serialization
+        # is the hot path. Nesting depth doesn't grow the Python call stack.
+        yield self._open_tag()
+        # Looked up once instead of binding a method for every leaf
+        leaf_to_html = LeafNode.to_html
+        stack = [(self, iter(self._children))]
+        while stack:
+            node, children = stack[-1]
+            for child in children:
+                if type(child) is LeafNode:
+                    yield leaf_to_html(child)
+                elif isinstance(child, ParentNode):
+                    yield child._open_tag()
+                    # Descending, the parent's iterator resumes once this child is closed
+                    stack.append((child, iter(child._children)))
+                    break
+                else:
+                    yield from child.iter_html()
+            else:
+                stack.pop()
+                yield f"</{node.tag}>"
+
+    def _iter_minified_html(self):
+        # The traversal of iter_html, also counting how many open elements keep their whitespace.
+        # Nothing inside those is minified.
+        preserve = 1 if self.tag in WHITESPACE_TAGS else 0
+        yield self._open_tag(True)
+        stack = [(self, iter(self._children))]
+        while stack:
+            node, children = stack[-1]
+            for child in children:
+                if type(child) is LeafNode:
+                    yield child.to_html(not preserve)
+                elif isinstance(child, ParentNode):
+                    yield child._open_tag(True)
+                    if child.tag in WHITESPACE_TAGS:
+                        preserve += 1
+                    stack.append((child, iter(child._children)))
+                    break
+                else:
+                    yield from child.iter_html(not preserve)
+            else:
+                stack.pop()
+                if node.tag in WHITESPACE_TAGS:
+                    preserve -= 1
+                yield f"</{node.tag}>"
+
+    def _open_tag(self, minify=False):
         if self.tag is None:
             raise ValueError("Parent nodes must have a tag")
-        if self.children == []:
+        if not self._children:
             raise ValueError("Parent node Children lists must not be empty")
-        else:
-            result = ""
-            for child in self.children:
-                result += child.to_html()
-            return (f"<{self.tag}{self.props_to_html()}>{result}</{self.tag}>")
\ No newline at end of file
+        return f"<{self.tag}{self.props_to_html(minify)}>"
+
+def walk(root):
+    # Yields (node, entering) pairs in document order using an explicit stack:
+    # (node, True) before a node's children and (node, False) after them.
+    # Only ParentNode children are descended into.
+    yield root, True
+    if isinstance(root, ParentNode):
+        stack = [(root, iter(root._children))]
+        while stack:
+            node, children = stack[-1]
+            for child in children:
+                yield child, True
+                if isinstance(child, ParentNode):
+                    stack.append((child, iter(child._children)))
+                    break
+                yield child, False
+            else:
+                stack.pop()
+                if stack:
+                    yield node, False
+    yield root, False
+
+def visit(root, pre=None, post=None):
+    # Calls pre(node) in pre-order and post(node) in post-order for every node
+    for node, entering in walk(root):
+        if entering:
+            if pre is not None:
+                pre(node)
+        elif post is not None:
+            post(node)
+
+def transform(root, func):
+    # Rebuilds the tree bottom-up: func gets each node after its children were
+    # transformed and returns the replacement node, or None to drop it.
+    # Parent nodes and their props are copied, the original tree is left untouched.
+    results = [[]]
+    for node, entering in walk(root):
+        if isinstance(node, ParentNode):
+            if entering:
+                results.append([])
+                continue
+            children = results.pop()
+            node = ParentNode(node.tag, children, node._props)
+        elif entering:
+            continue
+
+        replacement = func(node)
+        if replacement is not None:
+            results[-1].append(replacement)
+
+    transformed = results[0]
+    return transformed[0] if transformed else None
+
+def _copy_node(node):
+    # Parent nodes arrive here already copied by transform, props included
+    if type(node) is LeafNode:
+        return LeafNode(node.tag, node.value, node._props or None)
+    return node
+
+def copy_tree(root):
+    # Independent copy of a tree, so a shared (e.g. cached) tree can be handed out safely
+    return transform(root, _copy_node)
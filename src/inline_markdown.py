@@ -1,6 +1,19 @@
 from textnode import TextType, TextNode
 import re
 
+# All inline syntax in one alternation so a paragraph is tokenized in a single scan.
+# Alternatives are tried in the same priority order the old five-pass pipeline used.
+_INLINE_PATTERN = re.compile(
+    r"\*\*(?P<bold>.*?)\*\*"
+    r"|_(?P<italic>.*?)_"
+    r"|`(?P<code>.*?)`"
+    r"|!\[(?P<image_alt>[^\[\]]*)\]\((?P<image_url>[^\(\)]*)\)"
+    r"|(?<!!)\[(?P<link_text>[^\[\]]*)\]\((?P<link_url>[^\(\)]*)\)",
+    re.DOTALL,
+)
+
+_INLINE_DELIMITERS = ("**", "_", "`")
+
 def split_nodes_delimiter(old_nodes, delimiter, text_type):
     new_nodes = []
     
@@ -33,13 +46,16 @@ def split_nodes_delimiter(old_nodes, delimiter, text_type):
                 
     return new_nodes
 
+_IMAGE_PATTERN = re.compile(r"!\[([^\[\]]*)\]\(([^\(\)]*)\)")
+_LINK_PATTERN = re.compile(r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)")
+
 def extract_markdown_images(text):
-    return re.findall(r"!\[([^\[\]]*)\]\(([^\(\)]*)\)", text)
+    return _IMAGE_PATTERN.findall(text)
 
 def extract_markdown_links(text):
-    return re.findall(r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)", text)
+    return _LINK_PATTERN.findall(text)
 
-def split_nodes_image(old_nodes):
+def _split_nodes_pattern(old_nodes, pattern, text_type):
     new_nodes = []
 
     # Skipping non-text nodes
@@ -48,97 +64,76 @@ def split_nodes_image(old_nodes):
             new_nodes.append(node)
             continue
 
-        # Extracting all images from the node's text
-        images = extract_markdown_images(node.text)
-
-        # If no images found, keeping the original node intact
-        if len(images) == 0:
-            new_nodes.append(node)
-            continue
-
-        # Processing images
-        remaining_text = node.text
-
-        for image_alt, image_url in images:
-            # Image markdown pattern to split on
-            image_markdown = f"![{image_alt}]({image_url})"
-
-            # Splitting the text into sections (before and after the image)
-            sections = remaining_text.split(image_markdown, 1)
+        text = node.text
+        position = 0
 
-            # Add the text before the image (if not empty)
-            if sections[0]:
-                new_nodes.append(TextNode(sections[0], TextType.TEXT))
-
-            # Adding the image node
-            new_nodes.append(TextNode(image_alt, TextType.IMAGE, image_url))
-
-            # Updating remaining text to be what comes after the image
-            if len(sections) > 1:
-                remaining_text = sections[1]
-            else:
-                remaining_text = ""
-
-        # Adding remaining text after ALL images
-        if remaining_text:
-            new_nodes.append(TextNode(remaining_text, TextType.TEXT))
-
-    return new_nodes
-
-# Same thing as above but for links instead of images
-def split_nodes_link(old_nodes):
-    new_nodes = []
+        # Slicing the text around each match span, so every character is copied once
+        for match in pattern.finditer(text):
+            start = match.start()
 
-    for node in old_nodes:
-        if node.text_type != TextType.TEXT:
-            new_nodes.append(node)
-            continue
+            # Add the text before the match (if not empty)
+            if start > position:
+                new_nodes.append(TextNode(text[position:start], TextType.TEXT))
 
-        links = extract_markdown_links(node.text)
+            new_nodes.append(TextNode(match.group(1), text_type, match.group(2)))
+            position = match.end()
 
-        if len(links) == 0:
+        # If nothing matched, keeping the original node intact
+        if position == 0:
             new_nodes.append(node)
             continue
 
-        remaining_text = node.text
-
-        for link_alt, link_url in links:
-            link_markdown = f"[{link_alt}]({link_url})"
-
-            sections = remaining_text.split(link_markdown, 1)
-
-            if sections[0]:
-                new_nodes.append(TextNode(sections[0], TextType.TEXT))
-
-            new_nodes.append(TextNode(link_alt, TextType.LINK, link_url))
-
-            if len(sections) > 1:
-                remaining_text = sections[1]
-            else:
-                remaining_text = ""
-
-        if remaining_text:
-            new_nodes.append(TextNode(remaining_text, TextType.TEXT))
+        # Adding remaining text after ALL matches
+        if position < len(text):
+            new_nodes.append(TextNode(text[position:], TextType.TEXT))
 
     return new_nodes
 
-def text_to_textnodes(text):
-    # Creating a list with one TextNode containing the entire text
-    nodes = [TextNode(text, TextType.TEXT)]
-
-    # Processing for bold text
-    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
-
-    # Processing for italic text
-    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
-
-    # Processing for code blocks
-    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
+def split_nodes_image(old_nodes):
+    return _split_nodes_pattern(old_nodes, _IMAGE_PATTERN, TextType.IMAGE)
 
-    # Processing images
-    nodes = split_nodes_image(nodes)
+def split_nodes_link(old_nodes):
+    return _split_nodes_pattern(old_nodes, _LINK_PATTERN, TextType.LINK)
 
-    # Processing links
-    nodes = split_nodes_link(nodes)
+def _check_unclosed_delimiters(text):
+    for delimiter in _INLINE_DELIMITERS:
+        if delimiter in text:
+            raise ValueError(f"No matching closing delimiter for '{delimiter}'")
 
-    return nodes
\ No newline at end of file
+def text_to_textnodes(text):
+    nodes = []
+    position = 0
+
+    # One left-to-right scan: plain text between matches becomes TEXT nodes
+    for match in _INLINE_PATTERN.finditer(text):
+        start = match.start()
+        if start > position:
+            plain = text[position:start]
+            _check_unclosed_delimiters(plain)
+            nodes.append(TextNode(plain, TextType.TEXT))
+
+        kind = match.lastgroup
+        if kind == "bold":
+            nodes.append(TextNode(match.group("bold"), TextType.BOLD))
+        elif kind == "italic":
+            nodes.append(TextNode(match.group("italic"), TextType.ITALIC))
+        elif kind == "code":
+            nodes.append(TextNode(match.group("code"), TextType.CODE))
+        elif kind == "image_url":
+            nodes.append(TextNode(match.group("image_alt"), TextType.IMAGE, match.group("image_url")))
+        else:
+            nodes.append(TextNode(match.group("link_text"), TextType.LINK, match.group("link_url")))
+
+        position = match.end()
+
+    # Adding remaining text after the last match
+    if position < len(text):
+        plain = text[position:]
+        _check_unclosed_delimiters(plain)
+        nodes.append(TextNode(plain, TextType.TEXT))
+
+    # Keeping the old behaviour of returning a single TEXT node for empty input
+    if not nodes:
+        nodes.append(TextNode(text, TextType.TEXT))
+
+    return nodes
@@ -0,0 +1,110 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import htmlnode
+import markdown_to_html_node
+
+# Pipeline functions that get timed, looked up as module globals at call time by markdown_to_html_node
+_PIPELINE_STAGES = ("markdown_to_blocks", "block_to_block_type", "text_to_textnodes")
+PAGE = "page"
+
+class Tracer:
+    # Per-page, per-stage wall and CPU timings. Nothing is wrapped until install() is called,
+    # so the pipeline runs at full speed when tracing is off.
+    def __init__(self):
+        self._originals = []
+        self._pid = os.getpid()
+        self.reset()
+
+    def reset(self):
+        self.events = []
+        # page -> {stage: [wall_ns, cpu_ns, calls]}
+        self.pages = {}
+        self.current_page = None
+
+    def install(self):
+        if self._originals:
+            return
+        for name in _PIPELINE_STAGES:
+            original = getattr(markdown_to_html_node, name)
+            self._originals.append((markdown_to_html_node, name, original))
+            setattr(markdown_to_html_node, name, self._wrap(name, original))
+        original = htmlnode.ParentNode.to_html
+        self._originals.append((htmlnode.ParentNode, "to_html", original))
+        htmlnode.ParentNode.to_html = self._wrap("to_html", original)
+
+    def uninstall(self):
+        for owner, name, original in reversed(self._originals):
+            setattr(owner, name, original)
+        self._originals = []
+
+    def _wrap(self, stage, func):
+        record = self._record
+
+        def timed(*args, **kwargs):
+            wall = time.perf_counter_ns()
+            cpu = time.thread_time_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(stage, wall, time.perf_counter_ns() - wall, time.thread_time_ns() - cpu)
+
+        return timed
+
+    def _record(self, stage, start_ns, wall_ns, cpu_ns):
+        page = self.current_page
+        totals = self.pages.setdefault(page, {}).setdefault(stage, [0, 0, 0])
+        totals[0] += wall_ns
+        totals[1] += cpu_ns
+        totals[2] += 1
+        self.events.append({
+            "name": stage,
+            "cat": "build",
+            "ph": "X",
+            "ts": start_ns / 1000,
+            "dur": wall_ns / 1000,
+            "pid": self._pid,
+            "tid": threading.get_ident(),
+            "args": {"page": page, "cpu_us": cpu_ns / 1000},
+        })
+
+    @contextmanager
+    def page(self, name):
+        # Everything timed inside is attributed to this page, and the page itself is timed as a whole
+        previous = self.current_page
+        self.current_page = name
+        wall = time.perf_counter_ns()
+        cpu = time.thread_time_ns()
+        try:
+            yield
+        finally:
+            self._record(PAGE, wall, time.perf_counter_ns() - wall, time.thread_time_ns() - cpu)
+            self.current_page = previous
+
+    def export_chrome_trace(self, path):
+        # Trace event JSON, opens in chrome://tracing or https://ui.perfetto.dev
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump({"traceEvents": self.events, "displayTimeUnit": "ms"}, file)
+
+    def slowest_pages(self, count=20):
+        # (page, wall_ns, cpu_ns, {stage: wall_ns}) for the pages with the most wall time
+        rows = []
+        for page, stages in self.pages.items():
+            if page is None or PAGE not in stages:
+                continue
+            wall, cpu, _ = stages[PAGE]
+            breakdown = {stage: totals[0] for stage, totals in stages.items() if stage != PAGE}
+            rows.append((page, wall, cpu, breakdown))
+        rows.sort(key=lambda row: row[1], reverse=True)
+        return rows[:count]
+
+    def summary(self, count=20):
+        stages = _PIPELINE_STAGES + ("to_html",)
+        lines = [f"Slowest {count} pages (ms): wall cpu " + " ".join(stages)]
+        for page, wall, cpu, breakdown in self.slowest_pages(count):
+            per_stage = " ".join(f"{breakdown.get(stage, 0) / 1e6:.2f}" for stage in stages)
+            lines.append(f"{page}: {wall / 1e6:.2f} {cpu / 1e6:.2f} {per_stage}")
+        return "\n".join(lines)
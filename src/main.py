@@ -1,7 +1,118 @@
-from textnode import TextNode, TextType
+import argparse
+import time
 
-def main():
-    new_textnode = TextNode("A link to the git repo for this project!", TextType.LINK, "https://github.com/adamatiks/Static_Site_Generator")
-    print(new_textnode)
+from build import build_site
+from markdown_to_html_node import enable_disk_cache, enable_fast_inline, enable_render_cache
+from instrument import Tracer
 
-main()
\ No newline at end of file
+def add_build_arguments(parser):
+    parser.add_argument("--content", default="content", help="directory with markdown pages")
+    parser.add_argument("--template", default="template.html", help="default page template")
+    parser.add_argument("--templates", default="templates", help="directory with named templates chosen by <!-- template: name -->")
+    parser.add_argument("--static", default="static", help="directory with static assets")
+    parser.add_argument("--includes", default="includes", help="directory with files pulled in by {{> file }} blocks")
+    parser.add_argument("--dest", default="public", help="output directory")
+    parser.add_argument("--state", default=".build_state.json", help="incremental build state file")
+    parser.add_argument("--jobs", type=int, default=1, help="number of worker processes used to render pages")
+    parser.add_argument("--io-threads", type=int, default=4, help="threads reading sources ahead of rendering (0 reads and writes inline)")
+    parser.add_argument("--read-ahead", type=int, default=32, help="read pages allowed to wait for rendering")
+    parser.add_argument("--write-queue", type=int, default=64, help="rendered pages allowed to wait for being written")
+    parser.add_argument("--memo-entries", type=int, default=0, help="memoize up to N repeated blocks and inline texts (0 disables)")
+    parser.add_argument("--memo-bytes", type=int, default=32 * 1024 * 1024, help="approximate memory budget for memoization")
+    parser.add_argument("--hardlink-static", action="store_true", help="hard link static files instead of copying (same filesystem only)")
+    parser.add_argument("--checksum-static", action="store_true", help="compare static files by content hash instead of mtime")
+    parser.add_argument("--minify", action="store_true", help="collapse insignificant whitespace and drop optional attribute quotes")
+    parser.add_argument("--fast-inline", action="store_true", help="render inline text straight to HTML without a node per span")
+    parser.add_argument("--gzip", type=int, choices=range(1, 10), metavar="LEVEL", help="also write a .gz of every output file at this level")
+    parser.add_argument("--gzip-min-size", type=int, default=256, help="don't compress files smaller than this many bytes")
+    parser.add_argument("--block-cache", help="SQLite file keeping rendered blocks between builds, e.g. .block_cache.sqlite")
+    parser.add_argument("--block-cache-bytes", type=int, default=64 * 1024 * 1024, help="size cap of the block cache")
+    parser.add_argument("--manifest", help="write a manifest of every output file (path, size, hash) here, and its diff "
+                        "against the previous build next to it")
+    parser.add_argument("--explain", action="store_true", help="print why each page was rebuilt")
+    parser.add_argument("--trace", help="time every stage of every page (renders serially) and write a Chrome trace here")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Build the static site from markdown content.")
+    add_build_arguments(parser)
+    return parser.parse_args(argv)
+
+def print_report(report, elapsed, explain=False):
+    if explain:
+        for page in report["built"]:
+            print(f"{page}: {', '.join(report['reasons'][page])}")
+    print(
+        f"Built {len(report['built'])} pages, skipped {len(report['skipped'])}, "
+        f"removed {len(report['removed'])}, copied {report['static']} static files in {elapsed:.3f}s"
+    )
+    unchanged = len(report["built"]) - len(report["written"])
+    if unchanged:
+        print(f"{unchanged} rebuilt pages were identical to their output and left untouched")
+    sync = report["static_sync"]
+    if sync is not None:
+        print(
+            f"Static files: {sync['copied']} copied ({sync['bytes_copied']} bytes), {sync['linked']} linked, "
+            f"{sync['skipped']} unchanged ({sync['bytes_skipped']} bytes), {len(sync['removed'])} removed"
+        )
+    gzip = report["gzip"]
+    if gzip is not None:
+        print(
+            f"Gzip: {gzip['compressed']} compressed ({gzip['bytes_in']} -> {gzip['bytes_out']} bytes), "
+            f"{gzip['unchanged']} unchanged, {gzip['not_worth_it']} not worth it, {gzip['removed']} removed"
+        )
+    manifest = report["manifest"]
+    if manifest is not None:
+        print(
+            f"Manifest: {len(manifest['added'])} added, {len(manifest['changed'])} changed, "
+            f"{len(manifest['removed'])} removed"
+        )
+    io = report["io"]
+    if io is not None:
+        reads = io["read_queue"]
+        writes = io["write_queue"]
+        print(
+            f"I/O: {io['threads']} reader threads, read queue max {reads['max_depth']}/{reads['capacity']} "
+            f"(mean {reads['mean_depth']:.1f}), rendering waited {reads['get_wait']:.3f}s for reads, "
+            f"readers blocked {reads['put_wait']:.3f}s; write queue max {writes['max_depth']}/{writes['capacity']} "
+            f"(mean {writes['mean_depth']:.1f}), rendering blocked {writes['put_wait']:.3f}s, "
+            f"{writes['items']} writes in {io['write_batches']} batches"
+        )
+    if report["cache"] is not None:
+        for name, stats in report["cache"].items():
+            print(
+                f"{name} cache: {stats['hits']} hits, {stats['misses']} misses, {stats['evictions']} evictions, "
+                f"{stats['entries']} entries, {stats['bytes']} bytes"
+            )
+
+def configure(args):
+    if args.memo_entries > 0:
+        enable_render_cache(args.memo_entries, args.memo_bytes)
+    if args.block_cache:
+        enable_disk_cache(args.block_cache, args.block_cache_bytes)
+    if args.fast_inline:
+        enable_fast_inline()
+
+def main(argv=None):
+    args = parse_args(argv)
+    configure(args)
+    tracer = None
+    if args.trace:
+        tracer = Tracer()
+        tracer.install()
+    start = time.perf_counter()
+    try:
+        report = build_site(
+            args.content, args.template, args.dest, args.state, args.static, args.includes, args.jobs, args.templates, tracer,
+            args.hardlink_static, args.checksum_static, args.gzip, args.gzip_min_size, args.minify, args.io_threads,
+            args.read_ahead, args.write_queue, args.manifest
+        )
+    finally:
+        if tracer is not None:
+            tracer.uninstall()
+    print_report(report, time.perf_counter() - start, args.explain)
+    if tracer is not None:
+        tracer.export_chrome_trace(args.trace)
+        print(tracer.summary())
+
+if __name__ == "__main__":
+    main()
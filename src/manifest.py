@@ -0,0 +1,75 @@
+import json
+import os
+
+from static_sync import file_hash
+
+MANIFEST_VERSION = 1
+
+def diff_path(manifest_path):
+    # manifest.json -> manifest.diff.json
+    root, ext = os.path.splitext(manifest_path)
+    return root + ".diff" + (ext or ".json")
+
+def load_manifest(path):
+    # {rel_path: {"size", "hash", "mtime_ns"}} of the last build, empty when there is none
+    try:
+        with open(path, encoding="utf-8") as file:
+            manifest = json.load(file)
+    except (FileNotFoundError, ValueError):
+        return {}
+    if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+        return {}
+    return manifest["files"]
+
+def write_json(path, data):
+    temp_path = path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        json.dump(data, file, indent=1, sort_keys=True)
+    os.replace(temp_path, path)
+
+def scan_manifest(dest_dir, previous, known=None, exclude=()):
+    # Size and content hash of every file in dest_dir ("/" separated paths). A file whose size and mtime match
+    # its entry in previous or known keeps that entry's hash, so only files written since are read again.
+    known = known or {}
+    exclude = {os.path.abspath(path) for path in exclude}
+    files = {}
+    for root, dirs, names in os.walk(dest_dir):
+        for name in names:
+            path = os.path.join(root, name)
+            if os.path.abspath(path) in exclude:
+                continue
+            rel_path = os.path.relpath(path, dest_dir).replace(os.sep, "/")
+            stat = os.stat(path)
+            digest = None
+            for entry in (known.get(rel_path), previous.get(rel_path)):
+                if entry is not None and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+                    digest = entry["hash"]
+                    break
+            if digest is None:
+                digest = file_hash(path)
+            files[rel_path] = {"size": stat.st_size, "hash": digest, "mtime_ns": stat.st_mtime_ns}
+    return files
+
+def diff_manifests(previous, current):
+    # Paths to upload and delete for a deploy going from the previous manifest to the current one.
+    # A file counts as changed by its bytes only, a new mtime alone doesn't change it.
+    changed = []
+    for rel_path, entry in current.items():
+        before = previous.get(rel_path)
+        if before is not None and (before["size"] != entry["size"] or before["hash"] != entry["hash"]):
+            changed.append(rel_path)
+    return {
+        "added": sorted(set(current) - set(previous)),
+        "changed": sorted(changed),
+        "removed": sorted(set(previous) - set(current)),
+    }
+
+def update_manifest(manifest_path, dest_dir, known=None):
+    # Writes the manifest of dest_dir and its diff against the manifest written last time, returns the diff
+    previous = load_manifest(manifest_path)
+    exclude = [manifest_path, diff_path(manifest_path), manifest_path + ".tmp", diff_path(manifest_path) + ".tmp"]
+    files = scan_manifest(dest_dir, previous, known, exclude)
+    diff = diff_manifests(previous, files)
+    write_json(diff_path(manifest_path), diff)
+    write_json(manifest_path, {"version": MANIFEST_VERSION, "files": files})
+    return diff
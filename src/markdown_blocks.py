@@ -1,3 +1,5 @@
+import mmap
+import os
 import re
 from enum import Enum
 
@@ -9,6 +11,9 @@ class BlockType(Enum):
     UNORDERED_LIST = "unordered_list"
     ORDERED_LIST = "ordered_list"
 
+_BLOCK_SEPARATOR_PATTERN = re.compile(r"\n\s*\n")
+_HEADING_PATTERN = re.compile(r"#{1,6} ")
+
 def markdown_to_blocks(markdown):
     is_old_mac = '\r' in markdown and '\r\n' not in markdown
 
@@ -17,8 +22,7 @@ def markdown_to_blocks(markdown):
     if is_old_mac:
         raw_blocks = normalized.split('\n')
     else:
-        import re
-        raw_blocks = re.split(r'\n\s*\n', normalized)
+        raw_blocks = _BLOCK_SEPARATOR_PATTERN.split(normalized)
 
     blocks = []
     for block in raw_blocks:
@@ -30,7 +34,7 @@ def markdown_to_blocks(markdown):
 
 def block_to_block_type(block: str) -> BlockType:
     # Checking for heading block
-    heading_match = re.match(r"^#{1,6} ", block)
+    heading_match = _HEADING_PATTERN.match(block)
     if heading_match:
         return BlockType.HEADING
     
@@ -75,4 +79,182 @@ def block_to_block_type(block: str) -> BlockType:
     if is_ordered_list:
         return BlockType.ORDERED_LIST
     
-    return BlockType.PARAGRAPH
\ No newline at end of file
+    return BlockType.PARAGRAPH
+
+
+# Classifies one block while its lines are being read, so the block never has
+# to be split into lines again. Gives the same result as block_to_block_type.
+class _BlockBuilder:
+    def __init__(self):
+        self.lines = []
+        self.is_quote = True
+        self.is_unordered_list = True
+        self.is_ordered_list = True
+
+    def add_line(self, line):
+        if self.lines:
+            # The previous line is final now, only the last line gets rstripped later
+            self._check_line(self.lines[-1], len(self.lines))
+        else:
+            # The block text gets stripped, so the first line loses its indentation
+            line = line.lstrip()
+        self.lines.append(line)
+
+    def _check_line(self, line, number):
+        if self.is_quote and not line.startswith(">"):
+            self.is_quote = False
+        if self.is_unordered_list and not line.startswith("- "):
+            self.is_unordered_list = False
+        if self.is_ordered_list and not line.startswith(f"{number}. "):
+            self.is_ordered_list = False
+
+    def finish(self):
+        if not self.lines:
+            return None
+        self.lines[-1] = self.lines[-1].rstrip()
+        self._check_line(self.lines[-1], len(self.lines))
+        block = "\n".join(self.lines)
+
+        if _HEADING_PATTERN.match(block):
+            block_type = BlockType.HEADING
+        elif block.startswith("```") and block.endswith("```"):
+            block_type = BlockType.CODE
+        elif self.is_quote:
+            block_type = BlockType.QUOTE
+        elif self.is_unordered_list:
+            block_type = BlockType.UNORDERED_LIST
+        elif self.is_ordered_list:
+            block_type = BlockType.ORDERED_LIST
+        else:
+            block_type = BlockType.PARAGRAPH
+        return block_type, block
+
+def scan_blocks(lines, old_mac=None):
+    # Yields (BlockType, block) pairs from an iterable of lines, e.g. a file object opened with newline="".
+    # old_mac says whether every line is its own block, which markdown_to_blocks decides from the whole
+    # document (a \r without any \r\n). Lines can't be looked ahead of, so when it isn't given it is decided
+    # from the first line ending instead, which differs for documents mixing lone \r with \r\n or \n;
+    # scan_markdown_file passes the whole-file answer.
+    builder = _BlockBuilder()
+
+    for line in lines:
+        if old_mac is None and line.endswith("\r"):
+            old_mac = True
+        elif old_mac is None and line.endswith("\n"):
+            old_mac = False
+
+        line = line.rstrip("\r\n")
+
+        if old_mac:
+            # Every line is its own block
+            if line.strip():
+                builder.add_line(line)
+        elif line.strip():
+            builder.add_line(line)
+            continue
+
+        # Blank (whitespace only) lines end the current block
+        result = builder.finish()
+        if result is not None:
+            yield result
+        builder = _BlockBuilder()
+
+    result = builder.finish()
+    if result is not None:
+        yield result
+
+def _has_old_mac_line_endings(file, chunk_size=1024 * 1024):
+    # markdown_to_blocks' rule for a binary file: a \r somewhere and no \r\n anywhere
+    lone_cr = False
+    previous = b""
+    while True:
+        chunk = file.read(chunk_size)
+        if not chunk:
+            return lone_cr
+        # The last byte of the previous chunk catches a \r\n split between the two
+        data = previous + chunk
+        if b"\r\n" in data:
+            return False
+        lone_cr = lone_cr or b"\r" in chunk
+        previous = chunk[-1:]
+
+def scan_markdown_file(path):
+    with open(path, "rb") as file:
+        old_mac = _has_old_mac_line_endings(file)
+    with open(path, encoding="utf-8", newline="") as file:
+        yield from scan_blocks(file, old_mac)
+
+# Line breaks and whitespace of the UTF-8 bytes, matching what markdown_to_blocks sees after decoding:
+# \r\n, \r and \n all end a line, and whitespace is every character str.isspace() accepts.
+_NEWLINE = rb"(?:\r\n|\r(?!\n)|\n)"
+_SPACE = (
+    rb"(?:[ \t\v\f\x1c-\x1f]|\xc2[\x85\xa0]|\xe1\x9a\x80|\xe2\x80[\x80-\x8a\xa8\xa9\xaf]"
+    rb"|\xe2\x81\x9f|\xe3\x80\x80)"
+)
+# A line break, any number of whitespace only lines, and whatever whitespace follows up to the next block
+_BYTES_BLOCK_SEPARATOR_PATTERN = re.compile(_NEWLINE + _SPACE + b"*" + _NEWLINE + rb"(?:" + _SPACE + rb"|[\r\n])*")
+_BYTES_LINE_SEPARATOR_PATTERN = re.compile(rb"[\r\n]+")
+
+# Bytes scanned between giving the pages already read back to the page cache
+_MMAP_WINDOW = 16 * 1024 * 1024
+
+def _release(mapped, start, end):
+    # Drops mapped pages behind the scan from this process so they don't count towards its RSS.
+    # The file stays in the page cache, touching the range again just maps it back in.
+    madvise = getattr(mapped, "madvise", None)
+    if madvise is None or not hasattr(mmap, "MADV_DONTNEED"):
+        return
+    start -= start % mmap.PAGESIZE
+    end -= end % mmap.PAGESIZE
+    if end > start:
+        madvise(mmap.MADV_DONTNEED, start, end - start)
+
+def _contains(mapped, needle):
+    # mapped.find(needle) != -1, one window at a time
+    size = len(mapped)
+    position = 0
+    while position < size:
+        end = min(position + _MMAP_WINDOW, size)
+        # The search runs len(needle) - 1 bytes past the window so a match across its end is found too
+        if mapped.find(needle, position, min(end + len(needle) - 1, size)) != -1:
+            _release(mapped, 0, end)
+            return True
+        position = end
+        _release(mapped, 0, position)
+    return False
+
+def scan_mapped_blocks(mapped):
+    # Yields the same (BlockType, block) pairs as markdown_to_blocks and block_to_block_type would for the
+    # decoded text, from UTF-8 bytes supporting the buffer protocol (an mmap.mmap, bytes, ...). Block
+    # boundaries are found on the bytes, and only one block at a time is decoded.
+    is_old_mac = _contains(mapped, b"\r") and not _contains(mapped, b"\r\n")
+    pattern = _BYTES_LINE_SEPARATOR_PATTERN if is_old_mac else _BYTES_BLOCK_SEPARATOR_PATTERN
+    size = len(mapped)
+    released = 0
+    position = 0
+    while position < size:
+        # search() instead of finditer(): a pending iterator would keep the mmap from being closed
+        match = pattern.search(mapped, position)
+        end = size if match is None else match.start()
+        block = mapped[position:end].decode("utf-8")
+        position = size if match is None else match.end()
+        if "\r" in block:
+            block = block.replace("\r\n", "\n").replace("\r", "\n")
+        block = block.strip()
+        if block:
+            yield block_to_block_type(block), block
+        if position - released >= _MMAP_WINDOW:
+            _release(mapped, released, position)
+            released = position
+
+def scan_markdown_mmap(path):
+    # Like scan_markdown_file, for sources too big to read: the file is memory mapped instead of read, and
+    # pages are dropped from the process as the scan moves on, so memory use doesn't grow with the file size
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            # Empty files can't be mapped
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                mapped.madvise(mmap.MADV_SEQUENTIAL)
+            yield from scan_mapped_blocks(mapped)
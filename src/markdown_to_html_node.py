@@ -1,19 +1,263 @@
-from markdown_blocks import markdown_to_blocks, block_to_block_type, BlockType
-from htmlnode import HTMLNode, ParentNode, LeafNode
+from markdown_blocks import markdown_to_blocks, block_to_block_type, BlockType, scan_markdown_mmap
+from htmlnode import HTMLNode, ParentNode, LeafNode, RawNode, copy_tree, walk
 from inline_markdown import text_to_textnodes
-from textnode import text_node_to_html_node
+from textnode import TextNode, TextType, InlineHTMLNode, text_node_to_html_node
+from memo import LRUCache
+from block_cache import BlockCache, block_key
 
-def markdown_to_html_node(markdown):
+# Part of every disk cache key, bump it whenever a change makes blocks render differently
+RENDERER_VERSION = 1
+
+# Opt-in memoization of repeated blocks and inline text, see enable_render_cache
+_block_cache = None
+_inline_cache = None
+# Opt-in on-disk cache of rendered blocks shared across builds, see enable_disk_cache
+_disk_cache = None
+# Opt-in rendering of inline text without LeafNodes, see enable_fast_inline
+_fast_inline = False
+
+# Rough per-node cost used for the caches' byte budget, on top of the source text length
+_NODE_OVERHEAD = 100
+
+def enable_render_cache(max_entries=4096, max_bytes=32 * 1024 * 1024):
+    # The byte budget is split evenly between the block and inline caches
+    global _block_cache, _inline_cache
+    _block_cache = LRUCache(max_entries, max_bytes // 2 if max_bytes is not None else None)
+    _inline_cache = LRUCache(max_entries, max_bytes // 2 if max_bytes is not None else None)
+
+def disable_render_cache():
+    global _block_cache, _inline_cache
+    _block_cache = None
+    _inline_cache = None
+
+def enable_disk_cache(path, max_bytes=64 * 1024 * 1024):
+    global _disk_cache
+    disable_disk_cache()
+    _disk_cache = BlockCache(path, max_bytes)
+
+def disable_disk_cache():
+    global _disk_cache
+    if _disk_cache is not None:
+        _disk_cache.close()
+    _disk_cache = None
+
+def enable_fast_inline():
+    # Inline text of a block becomes one InlineHTMLNode instead of a LeafNode per span. The HTML is the same,
+    # but tree walks and transforms no longer see the spans.
+    global _fast_inline
+    _fast_inline = True
+
+def disable_fast_inline():
+    global _fast_inline
+    _fast_inline = False
+
+def render_settings():
+    # What enable_render_cache, enable_disk_cache and enable_fast_inline set up in this process, as a picklable
+    # tuple for apply_render_settings in worker processes, which don't inherit it under the spawn start method
+    memo = None
+    if _block_cache is not None:
+        max_bytes = None if _block_cache.max_bytes is None else _block_cache.max_bytes + _inline_cache.max_bytes
+        memo = (_block_cache.max_entries, max_bytes)
+    disk = None if _disk_cache is None else (_disk_cache.path, _disk_cache.max_bytes)
+    return memo, disk, _fast_inline
+
+def apply_render_settings(settings):
+    # Left alone when this process already has them, e.g. a worker forked from the process they came from
+    if settings == render_settings():
+        return
+    memo, disk, fast_inline = settings
+    if memo is None:
+        disable_render_cache()
+    else:
+        enable_render_cache(*memo)
+    if disk is None:
+        disable_disk_cache()
+    else:
+        enable_disk_cache(*disk)
+    if fast_inline:
+        enable_fast_inline()
+    else:
+        disable_fast_inline()
+
+def render_cache_stats():
+    stats = {}
+    if _block_cache is not None:
+        stats["block"] = _block_cache.stats()
+        stats["inline"] = _inline_cache.stats()
+    if _disk_cache is not None:
+        stats["disk"] = _disk_cache.stats()
+    return stats or None
+
+def markdown_to_html_node(markdown, minify=False, lazy=False):
+    # minify only matters with the disk cache: it picks which serialization of the blocks is looked up
+    # right away, the tree still serializes correctly either way (see CachedBlockNode).
+    # With lazy, blocks are parsed only once something looks at them (see LazyBlockNode).
     blocks = markdown_to_blocks(markdown)
+    if _disk_cache is not None:
+        if lazy:
+            # Cached blocks are never parsed at all, there would be no tree to look into
+            raise ValueError("lazy blocks can't be used with the disk cache")
+        return ParentNode("div", _cached_blocks(blocks, minify))
+    if lazy:
+        return ParentNode("div", [LazyBlockNode(block) for block in blocks])
+
+    children = [block_to_html_node(block) for block in blocks]
+    return ParentNode("div", children)
+
+def _cached_blocks(blocks, minify):
+    # Blocks found on disk are spliced in as raw HTML, the others are rendered and stored for next time
+    minify = bool(minify)
+    keys = [block_key(block, RENDERER_VERSION, minify) for block in blocks]
+    found = _disk_cache.get_many(keys)
+    children = []
+    rendered = []
+    for block, key in zip(blocks, keys):
+        html = found.get(key)
+        if html is None:
+            html = block_to_html_node(block).to_html(minify)
+            found[key] = html
+            rendered.append((key, html))
+        children.append(CachedBlockNode(block, html, minify))
+    _disk_cache.put_many(rendered)
+    return children
+
+class CachedBlockNode(RawNode):
+    # The HTML of one block from the disk cache, serialized with the given minify setting. Serializing it with
+    # the other setting looks that variant up (or renders and stores it) instead of handing out the wrong one.
+    __slots__ = ("block", "minify")
+
+    def __init__(self, block, html, minify):
+        super().__init__(html)
+        self.block = block
+        self.minify = minify
+
+    def to_html(self, minify=False):
+        if bool(minify) == self.minify:
+            return self.value
+        key = block_key(self.block, RENDERER_VERSION, bool(minify))
+        html = _disk_cache.get(key) if _disk_cache is not None else None
+        if html is None:
+            html = block_to_html_node(self.block).to_html(minify)
+            if _disk_cache is not None:
+                _disk_cache.put(key, html)
+        return html
+
+    def iter_html(self, minify=False):
+        yield self.to_html(minify)
 
-    for block in blocks:
-        block_type = block_to_block_type(block)
-        if block_type == BlockType.HEADING:
-            pass
+def block_to_html_node(block):
+    if _block_cache is None:
+        return _block_to_html_node(block)
+
+    node = _block_cache.get(block)
+    if node is None:
+        node = _block_to_html_node(block)
+        _block_cache.put(block, node, len(block) + _NODE_OVERHEAD * sum(1 for _ in walk(node)))
+    # Handing out a copy, so callers changing the tree can't corrupt the cached one
+    return copy_tree(node)
+
+def _parsed_attribute(name):
+    return property(
+        lambda node: getattr(node._parsed(), name),
+        lambda node, value: setattr(node._parsed(), name, value),
+    )
+
+class LazyBlockNode(ParentNode):
+    # Stands in for the node of one markdown block and parses the block the first time its tag, children,
+    # props or HTML are needed. Listing pages that only show the first few blocks never parse the rest.
+    __slots__ = ("block", "_node")
+
+    def __init__(self, block):
+        self.block = block
+        self._node = None
+
+    def _parsed(self):
+        node = self._node
+        if node is None:
+            node = self._node = block_to_html_node(self.block)
+        return node
+
+    # Everything a node is made of comes from the parsed node, overriding the slots inherited from HTMLNode
+    tag = _parsed_attribute("tag")
+    value = _parsed_attribute("value")
+    _children = _parsed_attribute("_children")
+    _props = _parsed_attribute("_props")
+
+    @property
+    def parsed(self):
+        return self._node is not None
+
+    def to_html(self, minify=False):
+        return self._parsed().to_html(minify)
+
+    def iter_html(self, minify=False):
+        return self._parsed().iter_html(minify)
+
+def write_markdown_mmap(path, fp, minify=False):
+    # Writes the same HTML as markdown_to_html_node(<file contents>) to fp, for sources too big to hold in
+    # memory: the file is memory mapped and every block is parsed, written and dropped before the next one
+    fp.write("<div>")
+    for block_type, block in scan_markdown_mmap(path):
+        typed_block_to_html_node(block_type, block).write_to(fp, minify)
+    fp.write("</div>")
+
+def _block_to_html_node(block):
+    return typed_block_to_html_node(block_to_block_type(block), block)
+
+def typed_block_to_html_node(block_type, block):
+    if block_type == BlockType.HEADING:
+        return heading_block_to_html_node(block)
+    elif block_type == BlockType.CODE:
+        return code_block_to_html_node(block)
+    elif block_type == BlockType.QUOTE:
+        return quote_block_to_html_node(block)
+    elif block_type == BlockType.UNORDERED_LIST:
+        return unordered_list_block_to_html_node(block)
+    elif block_type == BlockType.ORDERED_LIST:
+        return ordered_list_block_to_html_node(block)
+    else:
+        return paragraph_block_to_html_node(block)
+
+def text_to_children(text):
+    if _inline_cache is None:
+        textnodes = text_to_textnodes(text)
+    else:
+        # Cached TextNodes are never handed out, only fresh LeafNodes built from them
+        textnodes = _inline_cache.get(text)
+        if textnodes is None:
+            textnodes = tuple(text_to_textnodes(text))
+            _inline_cache.put(text, textnodes, len(text) + _NODE_OVERHEAD * len(textnodes))
+    if _fast_inline:
+        return [InlineHTMLNode(textnodes)]
+    return [text_node_to_html_node(node) for node in textnodes]
 
 def heading_block_to_html_node(block):
     heading_size = block.split()[0].count("#")
     heading_content = block.split(" ", 1)[1].strip()
-    textnodes = text_to_textnodes(heading_content)
-    htmlnodes = [text_node_to_html_node(node) for node in textnodes]
-    return ParentNode(f"h{heading_size}", htmlnodes)
\ No newline at end of file
+    return ParentNode(f"h{heading_size}", text_to_children(heading_content))
+
+def paragraph_block_to_html_node(block):
+    # Lines of a paragraph are joined back into one line of text
+    paragraph = " ".join(block.split("\n"))
+    return ParentNode("p", text_to_children(paragraph))
+
+def code_block_to_html_node(block):
+    code = block[3:-3]
+    # Dropping the opening fence line (and its language tag, if any)
+    if "\n" in code:
+        code = code.split("\n", 1)[1]
+    # Code is not parsed for inline markdown
+    code_node = text_node_to_html_node(TextNode(code, TextType.CODE))
+    return ParentNode("pre", [code_node])
+
+def quote_block_to_html_node(block):
+    lines = [line.lstrip(">").strip() for line in block.split("\n")]
+    return ParentNode("blockquote", text_to_children(" ".join(lines)))
+
+def unordered_list_block_to_html_node(block):
+    items = [ParentNode("li", text_to_children(line[2:])) for line in block.split("\n")]
+    return ParentNode("ul", items)
+
+def ordered_list_block_to_html_node(block):
+    items = [ParentNode("li", text_to_children(line.split(". ", 1)[1])) for line in block.split("\n")]
+    return ParentNode("ol", items)
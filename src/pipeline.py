@@ -0,0 +1,188 @@
+import queue
+import threading
+import time
+
+# Put on a queue after its last item
+_DONE = object()
+# Seconds between checks whether a producer blocked on a full queue should give up
+_POLL = 0.1
+
+class QueueStats:
+    # How full a bounded queue got and how long both of its ends waited, over every queue it was used for
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.items = 0
+        self.depth_total = 0
+        self.max_depth = 0
+        # Producers waiting for room (backpressure) and the consumer waiting for items (starved)
+        self.put_wait = 0.0
+        self.get_wait = 0.0
+
+    def to_dict(self):
+        return {
+            "capacity": self.capacity,
+            "items": self.items,
+            "max_depth": self.max_depth,
+            "mean_depth": self.depth_total / self.items if self.items else 0.0,
+            "put_wait": self.put_wait,
+            "get_wait": self.get_wait,
+        }
+
+class BoundedQueue(queue.Queue):
+    def __init__(self, stats, stop=None):
+        super().__init__(stats.capacity)
+        self.stats = stats
+        # A threading.Event; once it is set, producers blocked on a full queue stop waiting
+        self.stop = stop
+
+    def _put(self, item):
+        # Called with the queue's mutex held, so the depth seen here is exact
+        super()._put(item)
+        if item is _DONE:
+            return
+        depth = len(self.queue)
+        self.stats.items += 1
+        self.stats.depth_total += depth
+        if depth > self.stats.max_depth:
+            self.stats.max_depth = depth
+
+    def put_item(self, item):
+        # Blocks while the queue is full. Returns False if the queue was stopped before there was room.
+        start = time.perf_counter()
+        while True:
+            try:
+                self.put(item, timeout=None if self.stop is None else _POLL)
+                break
+            except queue.Full:
+                if self.stop.is_set():
+                    return False
+        with self.mutex:
+            self.stats.put_wait += time.perf_counter() - start
+        return True
+
+    def get_item(self):
+        start = time.perf_counter()
+        item = self.get()
+        self.stats.get_wait += time.perf_counter() - start
+        return item
+
+class IOPipeline:
+    # Overlaps file I/O with rendering: reader threads load sources ahead of the render loop, and a writer thread
+    # writes finished pages behind it. Both queues are bounded, so readers and the render loop block instead of
+    # piling up data when the next stage falls behind. Writes go through write_file(path, data), whose results
+    # flush() hands back; a pipeline only used for prefetch() doesn't need one.
+    def __init__(self, threads=4, read_depth=32, write_depth=64, write_batch=16, write_file=None):
+        self.threads = threads
+        self.write_batch = write_batch
+        self.write_file = write_file
+        self.read_stats = QueueStats(read_depth)
+        self.write_stats = QueueStats(write_depth)
+        self.batches = 0
+        self._writes = None
+        self._writer = None
+        self._write_error = None
+        self._written = []
+
+    def prefetch(self, items, load):
+        # Yields (item, load(item)) for a list of items, in the order the loads finish. Errors of a load
+        # are raised here. Closing the generator early stops the readers.
+        stop = threading.Event()
+        results = BoundedQueue(self.read_stats, stop)
+        pending = iter(items)
+        lock = threading.Lock()
+
+        def read():
+            while not stop.is_set():
+                with lock:
+                    item = next(pending, _DONE)
+                if item is _DONE:
+                    break
+                try:
+                    entry = (item, load(item), None)
+                except Exception as error:
+                    entry = (item, None, error)
+                if not results.put_item(entry):
+                    return
+            results.put_item(_DONE)
+
+        readers = [threading.Thread(target=read, daemon=True) for _ in range(min(self.threads, len(items)))]
+        for reader in readers:
+            reader.start()
+        try:
+            running = len(readers)
+            while running:
+                entry = results.get_item()
+                if entry is _DONE:
+                    running -= 1
+                    continue
+                item, value, error = entry
+                if error is not None:
+                    raise error
+                yield item, value
+        finally:
+            stop.set()
+            for reader in readers:
+                reader.join()
+
+    def write(self, path, data):
+        # Queues writing data to path, blocking while write_depth writes are already waiting
+        if self.write_file is None:
+            raise ValueError("IOPipeline was created without a write_file")
+        if self._write_error is not None:
+            self.flush()
+        if self._writer is None:
+            self._writes = BoundedQueue(self.write_stats)
+            self._writer = threading.Thread(target=self._write_loop, daemon=True)
+            self._writer.start()
+        self._writes.put_item((path, data))
+
+    def _write_loop(self):
+        writes = self._writes
+        while True:
+            batch = [writes.get_item()]
+            # Whatever else is waiting already goes out in the same pass
+            while len(batch) < self.write_batch and batch[-1] is not _DONE:
+                try:
+                    batch.append(writes.get_nowait())
+                except queue.Empty:
+                    break
+            done = batch[-1] is _DONE
+            if done:
+                batch.pop()
+            if batch:
+                self.batches += 1
+            for path, data in batch:
+                if self._write_error is not None:
+                    # Still draining the queue so writers don't block, but nothing is written after an error
+                    continue
+                try:
+                    self._written.append((path, self.write_file(path, data)))
+                except Exception as error:
+                    # Any error, the writer must keep emptying the queue or write() and flush() would block
+                    self._write_error = error
+            if done:
+                return
+
+    def flush(self):
+        # Waits until every queued write is on disk and returns the (path, write_file result) pairs of the
+        # writes since the last flush. Raises the first error a write ran into instead.
+        if self._writer is not None:
+            self._writes.put_item(_DONE)
+            self._writer.join()
+            self._writer = None
+            self._writes = None
+        error = self._write_error
+        written = self._written
+        self._write_error = None
+        self._written = []
+        if error is not None:
+            raise error
+        return written
+
+    def stats(self):
+        return {
+            "threads": self.threads,
+            "read_queue": self.read_stats.to_dict(),
+            "write_queue": self.write_stats.to_dict(),
+            "write_batches": self.batches,
+        }
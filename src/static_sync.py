@@ -0,0 +1,134 @@
+import hashlib
+import os
+import shutil
+
+# Largest single kernel copy request; both calls may copy less and are then called again
+_CHUNK = 1 << 30
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _kernel_copy(copy, source_fd, target_fd, offset, size):
+    # Copies with copy(source_fd, target_fd, offset, count) from offset up to size.
+    # Returns the offset reached, which is short when the platform refuses the copy for these files.
+    while offset < size:
+        try:
+            sent = copy(source_fd, target_fd, offset, min(size - offset, _CHUNK))
+        except OSError:
+            break
+        if sent == 0:
+            break
+        offset += sent
+    return offset
+
+def _copy_file_range(source_fd, target_fd, offset, count):
+    return os.copy_file_range(source_fd, target_fd, count, offset, offset)
+
+def _sendfile(source_fd, target_fd, offset, count):
+    os.lseek(target_fd, offset, os.SEEK_SET)
+    return os.sendfile(target_fd, source_fd, offset, count)
+
+# In order of preference, the ones this platform lacks are left out
+_KERNEL_COPIES = [copy for name, copy in (("copy_file_range", _copy_file_range), ("sendfile", _sendfile)) if hasattr(os, name)]
+
+def copy_file(source, target):
+    # Copies contents and metadata, in the kernel when possible (copy_file_range, then sendfile, then read/write).
+    # The copy goes to a temporary file that replaces target, so readers never see a partial file.
+    temp_path = target + ".tmp"
+    with open(source, "rb") as source_file, open(temp_path, "wb") as target_file:
+        size = os.fstat(source_file.fileno()).st_size
+        offset = 0
+        for copy in _KERNEL_COPIES:
+            offset = _kernel_copy(copy, source_file.fileno(), target_file.fileno(), offset, size)
+            if offset >= size:
+                break
+        # Whatever the kernel didn't copy (or a file that grew meanwhile) goes through userspace
+        source_file.seek(offset)
+        target_file.seek(offset)
+        shutil.copyfileobj(source_file, target_file)
+    shutil.copystat(source, temp_path)
+    os.replace(temp_path, target)
+
+def link_file(source, target):
+    # Hard links target to source, returns False when that isn't possible (other filesystem, no link support)
+    temp_path = target + ".tmp"
+    try:
+        if os.path.lexists(temp_path):
+            os.remove(temp_path)
+        os.link(source, temp_path)
+    except OSError:
+        return False
+    os.replace(temp_path, target)
+    return True
+
+def up_to_date(source_stat, target_path, source_path, checksum=False):
+    try:
+        target_stat = os.stat(target_path)
+    except FileNotFoundError:
+        return False
+    if os.path.samestat(source_stat, target_stat):
+        # Already a hard link to the source
+        return True
+    if source_stat.st_size != target_stat.st_size:
+        return False
+    if checksum:
+        return file_hash(source_path) == file_hash(target_path)
+    return source_stat.st_mtime_ns == target_stat.st_mtime_ns
+
+def find_static_files(static_dir):
+    paths = []
+    for root, dirs, files in os.walk(static_dir):
+        for name in files:
+            paths.append(os.path.relpath(os.path.join(root, name), static_dir).replace(os.sep, "/"))
+    return sorted(paths)
+
+def remove_orphan(dest_dir, rel_path):
+    path = os.path.join(dest_dir, rel_path)
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        return False
+    # Cleaning up directories left empty, but never dest_dir itself
+    directory = os.path.dirname(path)
+    while os.path.normpath(directory) != os.path.normpath(dest_dir):
+        try:
+            os.rmdir(directory)
+        except OSError:
+            break
+        directory = os.path.dirname(directory)
+    return True
+
+def sync_static(static_dir, dest_dir, previous=(), keep=(), hardlink=False, checksum=False):
+    # Mirrors static_dir into dest_dir, copying only files whose size or mtime (or hash with checksum) differ.
+    # previous are the files synced last time: those no longer in static_dir are deleted unless listed in keep,
+    # so generated pages and anything else in dest_dir are never touched.
+    # With hardlink the files are linked instead of copied, falling back to copies across filesystems.
+    report = {"files": [], "updated": [], "copied": 0, "linked": 0, "skipped": 0, "removed": [], "bytes_copied": 0, "bytes_skipped": 0}
+    files = find_static_files(static_dir) if os.path.isdir(static_dir) else []
+    for rel_path in files:
+        source = os.path.join(static_dir, rel_path)
+        target = os.path.join(dest_dir, rel_path)
+        stat = os.stat(source)
+        if up_to_date(stat, target, source, checksum):
+            report["skipped"] += 1
+            report["bytes_skipped"] += stat.st_size
+            continue
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        report["updated"].append(rel_path)
+        if hardlink and link_file(source, target):
+            report["linked"] += 1
+        else:
+            copy_file(source, target)
+            report["copied"] += 1
+            report["bytes_copied"] += stat.st_size
+    report["files"] = files
+
+    current = set(files) | set(keep)
+    for rel_path in sorted(set(previous) - current):
+        if remove_orphan(dest_dir, rel_path):
+            report["removed"].append(rel_path)
+    return report
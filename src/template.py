@@ -0,0 +1,68 @@
+import hashlib
+import os
+import re
+
+_PLACEHOLDER_PATTERN = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+# Parts of a template whose whitespace matters: whitespace-preserving elements and comments
+_PRESERVED_PATTERN = re.compile(r"<(pre|textarea|script|style)\b.*?</\1\s*>|<!--.*?-->", re.DOTALL | re.IGNORECASE)
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+def minify_source(source):
+    # Collapses whitespace runs (like indentation) to one space outside the preserved parts
+    parts = []
+    position = 0
+    for match in _PRESERVED_PATTERN.finditer(source):
+        parts.append(_WHITESPACE_PATTERN.sub(" ", source[position:match.start()]))
+        parts.append(match.group(0))
+        position = match.end()
+    parts.append(_WHITESPACE_PATTERN.sub(" ", source[position:]))
+    return "".join(parts).strip()
+
+class Template:
+    def __init__(self, source, minify=False):
+        # Parsed once into static text around named slots: static[0] slot[0] static[1] ... static[-1]
+        self.source = source
+        self.hash = hashlib.sha256(source.encode("utf-8")).hexdigest()
+        if minify:
+            source = minify_source(source)
+        self.static = []
+        self.slots = []
+        # The placeholder text itself, kept for slots without a value
+        self.placeholders = []
+        position = 0
+        for match in _PLACEHOLDER_PATTERN.finditer(source):
+            self.static.append(source[position:match.start()])
+            self.slots.append(match.group(1))
+            self.placeholders.append(match.group(0))
+            position = match.end()
+        self.static.append(source[position:])
+
+    def iter_chunks(self, values):
+        static = self.static
+        yield static[0]
+        for i, name in enumerate(self.slots):
+            # Placeholders without a value are left in the output as they were
+            yield values.get(name, self.placeholders[i])
+            yield static[i + 1]
+
+    def render(self, values):
+        return "".join(self.iter_chunks(values))
+
+    def write_to(self, fp, values):
+        fp.writelines(self.iter_chunks(values))
+
+class TemplateCache:
+    def __init__(self):
+        # (path, minify) -> (mtime_ns, size, Template)
+        self.templates = {}
+
+    def get(self, path, minify=False):
+        # Compiled template for path, recompiled only when the file's mtime or size changed
+        stat = os.stat(path)
+        cached = self.templates.get((path, minify))
+        if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2]
+        with open(path, encoding="utf-8") as file:
+            template = Template(file.read(), minify)
+        self.templates[(path, minify)] = (stat.st_mtime_ns, stat.st_size, template)
+        return template
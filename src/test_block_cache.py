@@ -0,0 +1,85 @@
+import os
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+from block_cache import BlockCache, block_key
+
+def _write_and_read(path, worker):
+    # Runs in another process, all of them sharing one cache file
+    cache = BlockCache(path)
+    cache.put_many([(f"{worker}-{i}", f"<p>{worker} {i}</p>") for i in range(50)])
+    found = cache.get_many([f"{other}-{i}" for other in range(4) for i in range(50)])
+    cache.close()
+    return len(found)
+
+class TestBlockKey(unittest.TestCase):
+    def test_options_change_the_key(self):
+        self.assertEqual(block_key("text", 1, False), block_key("text", 1, False))
+        self.assertNotEqual(block_key("text", 1, False), block_key("text", 2, False))
+        self.assertNotEqual(block_key("text", 1, False), block_key("text", 1, True))
+        self.assertNotEqual(block_key("text"), block_key("other"))
+
+class TestBlockCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "blocks.sqlite")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_put_and_get(self):
+        cache = BlockCache(self.path)
+        cache.put_many([("a", "<p>a</p>"), ("b", "<p>b</p>")])
+        self.assertEqual(cache.get_many(["a", "b", "c"]), {"a": "<p>a</p>", "b": "<p>b</p>"})
+        self.assertEqual(cache.get("a"), "<p>a</p>")
+        self.assertIsNone(cache.get("c"))
+        stats = cache.stats()
+        self.assertEqual((stats["entries"], stats["bytes"], stats["hits"], stats["misses"]), (2, 16, 3, 2))
+        cache.close()
+
+    def test_persists_across_instances(self):
+        cache = BlockCache(self.path)
+        cache.put("a", "<p>é</p>")
+        cache.close()
+        cache = BlockCache(self.path)
+        self.assertEqual(cache.get("a"), "<p>é</p>")
+        self.assertEqual(cache.stats()["bytes"], len("<p>é</p>".encode("utf-8")))
+        cache.close()
+
+    def test_evicts_least_recently_used(self):
+        cache = BlockCache(self.path, max_bytes=1000)
+        cache.put_many([(str(i), "x" * 100) for i in range(8)])
+        # Touching the oldest entry makes it the most recently used
+        cache.get("0")
+        # Writing past the budget evicts right away
+        cache.put_many([("8", "x" * 100), ("9", "x" * 100), ("10", "x" * 100)])
+        self.assertEqual(cache.stats()["evictions"], 1)
+        self.assertEqual(cache.evict(), 0)
+        self.assertLessEqual(cache.stats()["bytes"], 1000)
+        found = cache.get_many([str(i) for i in range(11)])
+        self.assertEqual(sorted(found, key=int), ["0", "2", "3", "4", "5", "6", "7", "8", "9", "10"])
+        cache.close()
+
+    def test_fragments_bigger_than_the_budget_are_not_stored(self):
+        cache = BlockCache(self.path, max_bytes=10)
+        cache.put("big", "x" * 11)
+        self.assertIsNone(cache.get("big"))
+        cache.close()
+
+    def test_many_keys(self):
+        cache = BlockCache(self.path)
+        cache.put_many([(str(i), str(i)) for i in range(1200)])
+        self.assertEqual(len(cache.get_many([str(i) for i in range(1300)])), 1200)
+        cache.close()
+
+    def test_concurrent_processes(self):
+        BlockCache(self.path).close()
+        with ProcessPoolExecutor(max_workers=4) as executor:
+            list(executor.map(_write_and_read, [self.path] * 4, range(4)))
+        cache = BlockCache(self.path)
+        self.assertEqual(cache.stats()["entries"], 200)
+        cache.close()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,324 @@
+import multiprocessing
+import os
+import tempfile
+import unittest
+
+from block_cache import BlockCache
+from fixtures import TempDirTestCase
+from markdown_to_html_node import disable_disk_cache, disable_render_cache, enable_disk_cache, enable_render_cache
+from build import SiteBuilder, build_site, chunk_by_size, expand_includes, extract_template_name, extract_title, render_page
+
+TEMPLATE = "<html><title>{{ Title }}</title><body>{{ Content }}</body></html>"
+
+class TestExtractTitle(unittest.TestCase):
+    def test_extract_title(self):
+        self.assertEqual(extract_title("# Hello"), "Hello")
+        self.assertEqual(extract_title("Intro\n\n#  Spaced title  \n\n## Sub"), "Spaced title")
+
+    def test_no_title(self):
+        with self.assertRaises(ValueError):
+            extract_title("## Only a subheading")
+
+    def test_expand_includes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(tmp, "note.md"), "w", encoding="utf-8") as file:
+                file.write("> Shared **note**\n")
+            markdown, included = expand_includes("# Page\n\n{{> note.md }}\n\nEnd", tmp)
+            self.assertEqual(markdown, "# Page\n\n> Shared **note**\n\nEnd")
+            self.assertEqual(included, ["note.md"])
+            with self.assertRaises(ValueError):
+                expand_includes("{{> missing.md }}", tmp)
+
+    def test_extract_template_name(self):
+        self.assertEqual(extract_template_name("<!-- template: blog -->\n# Post"), ("blog", "# Post"))
+        self.assertEqual(extract_template_name("# Post\n<!-- template: blog -->"), (None, "# Post\n<!-- template: blog -->"))
+
+    def test_render_page(self):
+        html = render_page("# Hello\n\nSome **text**", TEMPLATE)
+        self.assertEqual(html, "<html><title>Hello</title><body><div><h1>Hello</h1><p>Some <b>text</b></p></div></body></html>")
+
+    def test_render_page_escapes_title(self):
+        html = render_page("# Fish & Chips", TEMPLATE)
+        self.assertEqual(html, "<html><title>Fish &amp; Chips</title><body><div><h1>Fish &amp; Chips</h1></div></body></html>")
+
+class TestChunkBySize(unittest.TestCase):
+    def test_empty(self):
+        self.assertEqual(chunk_by_size({}, 4), [])
+
+    def test_big_pages_get_own_chunks_first(self):
+        sizes = {"big.md": 1000, "medium.md": 300}
+        sizes.update({f"small{i}.md": 10 for i in range(30)})
+        chunks = chunk_by_size(sizes, 2)
+        self.assertEqual(chunks[0], ["big.md"])
+        self.assertEqual(chunks[1], ["medium.md"])
+        self.assertEqual(sorted(path for chunk in chunks for path in chunk), sorted(sizes))
+        self.assertTrue(all(len(chunk) > 1 for chunk in chunks[2:]))
+
+class TestSiteBuilder(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        root = self.tmp.name
+        self.content = os.path.join(root, "content")
+        self.static = os.path.join(root, "static")
+        self.dest = os.path.join(root, "public")
+        self.template = os.path.join(root, "template.html")
+        self.state = os.path.join(root, "state.json")
+        self.includes = os.path.join(root, "includes")
+        self.templates = os.path.join(root, "templates")
+        self.write(self.template, TEMPLATE)
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\nWelcome")
+        self.write(os.path.join(self.content, "blog", "post.md"), "# Post\n\nA post")
+        self.write(os.path.join(self.static, "styles.css"), "body {}")
+
+    def build(self):
+        return build_site(self.content, self.template, self.dest, self.state, self.static, self.includes, templates_dir=self.templates)
+
+    def test_full_build(self):
+        report = self.build()
+        self.assertEqual(report["built"], ["blog/post.md", "index.md"])
+        self.assertEqual(report["static"], 1)
+        self.assertIn("<h1>Post</h1>", self.read(os.path.join(self.dest, "blog", "post.html")))
+        self.assertTrue(os.path.exists(os.path.join(self.dest, "styles.css")))
+
+    def test_static_sync(self):
+        self.build()
+        report = self.build()
+        self.assertEqual(report["static"], 0)
+        self.assertEqual(report["static_sync"]["skipped"], 1)
+        os.remove(os.path.join(self.static, "styles.css"))
+        report = self.build()
+        self.assertEqual(report["static_sync"]["removed"], ["styles.css"])
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "styles.css")))
+        self.assertTrue(os.path.exists(os.path.join(self.dest, "index.html")))
+
+    def test_gzip_sidecars(self):
+        build = lambda gzip_level: build_site(self.content, self.template, self.dest, self.state, self.static, self.includes,
+                                              templates_dir=self.templates, gzip_level=gzip_level, gzip_min_size=1)
+        report = build(6)
+        # styles.css is so small that gzip makes it bigger
+        self.assertEqual((report["gzip"]["compressed"], report["gzip"]["not_worth_it"]), (2, 1))
+        self.assertTrue(os.path.exists(os.path.join(self.dest, "blog", "post.html.gz")))
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "styles.css.gz")))
+        self.assertEqual(build(6)["gzip"]["unchanged"], 3)
+        os.remove(os.path.join(self.content, "blog", "post.md"))
+        self.assertEqual(build(6)["gzip"]["removed"], 1)
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "blog", "post.html.gz")))
+        build(None)
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "index.html.gz")))
+
+    def test_identical_output_is_not_rewritten(self):
+        for io_threads in (0, 4):
+            self.write(os.path.join(self.content, "index.md"), "# Home\n\nWelcome")
+            self.build()
+            index = os.path.join(self.dest, "index.html")
+            os.utime(index, ns=(1, 1))
+            # Source changed, but it renders to the same page
+            self.write(os.path.join(self.content, "index.md"), f"# Home\n\nWelcome\n\n\n{' ' * io_threads}")
+            report = build_site(self.content, self.template, self.dest, self.state, self.static, self.includes,
+                                templates_dir=self.templates, io_threads=io_threads)
+            self.assertEqual(report["built"], ["index.md"])
+            self.assertEqual(report["written"], [])
+            self.assertEqual(os.stat(index).st_mtime_ns, 1)
+
+            self.write(os.path.join(self.content, "index.md"), "# Home\n\nWelcome back")
+            report = build_site(self.content, self.template, self.dest, self.state, self.static, self.includes,
+                                templates_dir=self.templates, io_threads=io_threads)
+            self.assertEqual(report["written"], ["index.html"])
+            self.assertIn("Welcome back", self.read(index))
+
+    def test_manifest(self):
+        manifest = os.path.join(self.tmp.name, "manifest.json")
+        build = lambda: build_site(self.content, self.template, self.dest, self.state, self.static, self.includes,
+                                   templates_dir=self.templates, manifest_path=manifest)
+        self.assertEqual(build()["manifest"], {"added": ["blog/post.html", "index.html", "styles.css"], "changed": [], "removed": []})
+        self.assertEqual(build()["manifest"], {"added": [], "changed": [], "removed": []})
+        self.write(os.path.join(self.content, "blog", "post.md"), "# Post\n\nAn edited post")
+        os.remove(os.path.join(self.content, "index.md"))
+        self.assertEqual(build()["manifest"], {"added": [], "changed": ["blog/post.html"], "removed": ["index.html"]})
+
+    def test_minify(self):
+        self.build()
+        report = build_site(self.content, self.template, self.dest, self.state, self.static, self.includes,
+                            templates_dir=self.templates, minify=True)
+        self.assertEqual(report["built"], ["blog/post.md", "index.md"])
+        self.assertIn("render options changed", report["reasons"]["index.md"])
+        self.assertEqual(self.build()["built"], ["blog/post.md", "index.md"])
+
+    def test_unchanged_pages_are_skipped(self):
+        self.build()
+        report = self.build()
+        self.assertEqual(report["built"], [])
+        self.assertEqual(report["skipped"], ["blog/post.md", "index.md"])
+
+    def test_touched_but_identical_page_is_skipped(self):
+        self.build()
+        path = os.path.join(self.content, "index.md")
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        report = self.build()
+        self.assertEqual(report["built"], [])
+
+    def test_changed_page_is_rebuilt(self):
+        self.build()
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\nChanged welcome text")
+        report = self.build()
+        self.assertEqual(report["built"], ["index.md"])
+        self.assertIn("Changed welcome text", self.read(os.path.join(self.dest, "index.html")))
+
+    def test_template_change_rebuilds_everything(self):
+        self.build()
+        self.write(self.template, "<main>{{ Title }}{{ Content }}</main>")
+        report = self.build()
+        self.assertEqual(report["built"], ["blog/post.md", "index.md"])
+
+    def test_named_templates(self):
+        self.write(os.path.join(self.templates, "blog.html"), "<article>{{ Title }}: {{ Content }}</article>")
+        self.write(os.path.join(self.content, "blog", "post.md"), "<!-- template: blog -->\n# Post\n\nA post")
+        self.build()
+        self.assertEqual(self.read(os.path.join(self.dest, "blog", "post.html")), "<article>Post: <div><h1>Post</h1><p>A post</p></div></article>")
+
+        # Only pages using the changed template are rebuilt
+        self.write(os.path.join(self.templates, "blog.html"), "<section>{{ Content }}</section>")
+        report = self.build()
+        self.assertEqual(report["built"], ["blog/post.md"])
+        self.assertEqual(report["reasons"]["blog/post.md"], [f"template {os.path.join(self.templates, 'blog.html')} changed"])
+
+        self.write(self.template, "<main>{{ Content }}</main>")
+        self.assertEqual(self.build()["built"], ["index.md"])
+
+    def test_missing_output_is_rebuilt(self):
+        self.build()
+        os.remove(os.path.join(self.dest, "index.html"))
+        report = self.build()
+        self.assertEqual(report["built"], ["index.md"])
+
+    def test_removed_page(self):
+        self.build()
+        os.remove(os.path.join(self.content, "blog", "post.md"))
+        report = self.build()
+        self.assertEqual(report["removed"], ["blog/post.md"])
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "blog", "post.html")))
+
+    def test_include_change_rebuilds_including_pages(self):
+        self.write(os.path.join(self.includes, "footer.md"), "Shared footer")
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\n{{> footer.md }}")
+        self.build()
+        self.assertIn("Shared footer", self.read(os.path.join(self.dest, "index.html")))
+        self.write(os.path.join(self.includes, "footer.md"), "New footer")
+        report = self.build()
+        self.assertEqual(report["built"], ["index.md"])
+        self.assertEqual(report["reasons"]["index.md"], ["include footer.md changed"])
+        self.assertIn("New footer", self.read(os.path.join(self.dest, "index.html")))
+        self.assertEqual(self.build()["built"], [])
+
+    def test_title_change_rebuilds_linking_pages(self):
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\nRead [the post](/blog/post.html)")
+        self.write(os.path.join(self.content, "about.md"), "# About\n\nNo links here")
+        self.build()
+
+        # Body change only: linking pages don't need a rebuild
+        self.write(os.path.join(self.content, "blog", "post.md"), "# Post\n\nA longer post")
+        self.assertEqual(self.build()["built"], ["blog/post.md"])
+
+        self.write(os.path.join(self.content, "blog", "post.md"), "# Renamed post\n\nA longer post")
+        report = self.build()
+        self.assertEqual(report["built"], ["blog/post.md", "index.md"])
+        self.assertEqual(report["reasons"]["blog/post.md"], ["source changed"])
+        self.assertEqual(report["reasons"]["index.md"], ["linked page blog/post.md title changed"])
+
+    def test_removed_page_rebuilds_linking_pages(self):
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\nRead [the post](blog/post.md)")
+        self.build()
+        os.remove(os.path.join(self.content, "blog", "post.md"))
+        report = self.build()
+        self.assertEqual(report["built"], ["index.md"])
+        self.assertEqual(report["reasons"]["index.md"], ["linked page blog/post.md was removed"])
+
+    def test_added_page_rebuilds_linking_pages(self):
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\nSee [about](/about.html)")
+        self.build()
+        self.write(os.path.join(self.content, "about.md"), "# About")
+        report = self.build()
+        self.assertEqual(report["built"], ["about.md", "index.md"])
+        self.assertEqual(report["reasons"]["index.md"], ["linked page about.md was added"])
+
+    def test_parallel_build_matches_serial(self):
+        for i in range(12):
+            self.write(os.path.join(self.content, "pages", f"page{i}.md"), f"# Page {i}\n\n" + "Some **text** here. " * (i * 50))
+        self.build()
+        serial = {}
+        for root, dirs, files in os.walk(self.dest):
+            for name in files:
+                serial[os.path.join(root, name)] = self.read(os.path.join(root, name))
+
+        os.remove(self.state)
+        report = build_site(self.content, self.template, self.dest, self.state, self.static, self.includes, jobs=3)
+        self.assertEqual(len(report["built"]), 14)
+        self.assertEqual(report["built"], sorted(report["built"]))
+        for path, html in serial.items():
+            self.assertEqual(self.read(path), html)
+        self.assertEqual(build_site(self.content, self.template, self.dest, self.state, jobs=3)["built"], [])
+
+    def test_spawned_workers_get_render_settings(self):
+        # Spawned workers don't inherit module globals, the disk cache only fills up if they were handed it
+        for i in range(6):
+            self.write(os.path.join(self.content, "pages", f"page{i}.md"), f"# Page {i}\n\nParagraph {i}")
+        cache_path = os.path.join(self.tmp.name, "blocks.sqlite")
+        enable_disk_cache(cache_path)
+        try:
+            builder = SiteBuilder(self.content, self.template, self.dest, self.state, jobs=2,
+                                  mp_context=multiprocessing.get_context("spawn"))
+            try:
+                report = builder.build()
+            finally:
+                builder.close()
+        finally:
+            disable_disk_cache()
+        self.assertEqual(len(report["built"]), 8)
+        self.assertIn("<p>Paragraph 3</p>", self.read(os.path.join(self.dest, "pages", "page3.html")))
+        cache = BlockCache(cache_path)
+        try:
+            self.assertGreater(cache.stats()["entries"], 0)
+        finally:
+            cache.close()
+
+    def test_cache_stats_include_workers(self):
+        for i in range(6):
+            self.write(os.path.join(self.content, "pages", f"page{i}.md"), f"# Page {i}\n\nShared paragraph")
+        enable_render_cache(max_entries=64)
+        try:
+            report = build_site(self.content, self.template, self.dest, self.state, jobs=2)
+        finally:
+            disable_render_cache()
+        # Two blocks on each of the 8 pages, all looked up in the workers
+        block = report["cache"]["block"]
+        self.assertEqual(block["hits"] + block["misses"], 16)
+        self.assertGreater(block["entries"], 0)
+
+    def test_io_pipeline_matches_inline_io(self):
+        for i in range(12):
+            self.write(os.path.join(self.content, "pages", f"page{i}.md"), f"# Page {i}\n\n" + "Some **text** here. " * (i * 50))
+        report = build_site(self.content, self.template, self.dest, self.state, io_threads=0)
+        self.assertIsNone(report["io"])
+        inline = {}
+        for root, dirs, files in os.walk(self.dest):
+            for name in files:
+                inline[os.path.join(root, name)] = self.read(os.path.join(root, name))
+
+        os.remove(self.state)
+        report = build_site(self.content, self.template, self.dest, self.state, io_threads=3, read_depth=2, write_depth=2)
+        self.assertEqual(len(report["built"]), 14)
+        for path, html in inline.items():
+            self.assertEqual(self.read(path), html)
+        self.assertEqual(report["io"]["read_queue"]["items"], 14)
+        self.assertLessEqual(report["io"]["read_queue"]["max_depth"], 2)
+        self.assertEqual(report["io"]["write_queue"]["items"], 14)
+
+    def test_corrupt_state_means_full_build(self):
+        self.build()
+        self.write(self.state, "not json")
+        report = SiteBuilder(self.content, self.template, self.dest, self.state).build()
+        self.assertEqual(len(report["built"]), 2)
+
+if __name__ == "__main__":
+    unittest.main()
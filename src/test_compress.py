@@ -0,0 +1,82 @@
+import gzip
+import os
+import unittest
+
+from compress import compress_outputs
+from fixtures import TempDirTestCase
+
+class TestCompressOutputs(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.dest = self.tmp.name
+        self.write("index.html", "<p>hello</p>" * 100)
+        self.write("css/styles.css", "body { margin: 0 }\n" * 50)
+        self.write("tiny.txt", "hi")
+
+    def compress(self, entries, changed=(), rel_paths=("css/styles.css", "index.html", "tiny.txt"), level=9):
+        return compress_outputs(self.dest, list(rel_paths), entries, changed, level, min_size=64, workers=2)
+
+    def read_gz(self, rel_path):
+        with gzip.open(os.path.join(self.dest, rel_path + ".gz"), "rt", encoding="utf-8") as file:
+            return file.read()
+
+    def test_writes_sidecars(self):
+        entries, report = self.compress({})
+        self.assertEqual(self.read_gz("index.html"), "<p>hello</p>" * 100)
+        self.assertEqual(self.read_gz("css/styles.css"), "body { margin: 0 }\n" * 50)
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "tiny.txt.gz")))
+        self.assertEqual((report["compressed"], report["not_worth_it"]), (2, 1))
+        self.assertEqual(report["bytes_in"], 1200 + 950)
+        self.assertLess(report["bytes_out"], report["bytes_in"])
+        self.assertEqual(sorted(entries), ["css/styles.css", "index.html", "tiny.txt"])
+
+    def test_output_is_deterministic(self):
+        self.compress({})
+        with open(os.path.join(self.dest, "index.html.gz"), "rb") as file:
+            first = file.read()
+        self.compress({}, level=9)
+        with open(os.path.join(self.dest, "index.html.gz"), "rb") as file:
+            self.assertEqual(file.read(), first)
+
+    def test_unchanged_outputs_are_skipped(self):
+        entries, _ = self.compress({})
+        _, report = self.compress(entries)
+        self.assertEqual((report["compressed"], report["unchanged"]), (0, 3))
+
+    def test_rewritten_identical_output_is_skipped(self):
+        entries, _ = self.compress({})
+        self.write("index.html", "<p>hello</p>" * 100)
+        _, report = self.compress(entries, changed=["index.html"])
+        self.assertEqual((report["compressed"], report["unchanged"]), (0, 3))
+
+    def test_changed_output_is_compressed_again(self):
+        entries, _ = self.compress({})
+        self.write("index.html", "<p>bye</p>" * 100)
+        _, report = self.compress(entries, changed=["index.html"])
+        self.assertEqual(report["compressed"], 1)
+        self.assertEqual(self.read_gz("index.html"), "<p>bye</p>" * 100)
+
+    def test_missing_sidecar_and_new_level_are_compressed_again(self):
+        entries, _ = self.compress({})
+        os.remove(os.path.join(self.dest, "index.html.gz"))
+        entries, report = self.compress(entries)
+        self.assertEqual(report["compressed"], 1)
+        _, report = self.compress(entries, level=1)
+        self.assertEqual(report["compressed"], 2)
+
+    def test_incompressible_output_has_no_sidecar(self):
+        with open(os.path.join(self.dest, "random.bin"), "wb") as file:
+            file.write(os.urandom(512))
+        _, report = self.compress({}, rel_paths=["random.bin"])
+        self.assertEqual(report["not_worth_it"], 1)
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "random.bin.gz")))
+
+    def test_removed_outputs_lose_their_sidecar(self):
+        entries, _ = self.compress({})
+        entries, report = self.compress(entries, rel_paths=["css/styles.css"])
+        self.assertEqual(report["removed"], 1)
+        self.assertEqual(sorted(entries), ["css/styles.css"])
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "index.html.gz")))
+
+if __name__ == "__main__":
+    unittest.main()
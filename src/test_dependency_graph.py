@@ -0,0 +1,60 @@
+import unittest
+
+from dependency_graph import DependencyGraph, INCLUDE, LINK, TEMPLATE, resolve_link
+
+class TestDependencyGraph(unittest.TestCase):
+    def setUp(self):
+        self.graph = DependencyGraph()
+        self.graph.set_dependencies("index.md", TEMPLATE, ["template.html"])
+        self.graph.set_dependencies("index.md", LINK, ["blog/post.md", "about.md", "about.md"])
+        self.graph.set_dependencies("blog/post.md", LINK, ["about.md"])
+        self.graph.set_dependencies("blog/post.md", INCLUDE, ["footer.md"])
+
+    def test_dependencies(self):
+        self.assertEqual(self.graph.dependencies("index.md", LINK), ["about.md", "blog/post.md"])
+        self.assertEqual(self.graph.dependencies("index.md", INCLUDE), [])
+        self.assertEqual(self.graph.dependencies("missing.md", LINK), [])
+
+    def test_dependents(self):
+        self.assertEqual(self.graph.dependents("about.md", LINK), ["blog/post.md", "index.md"])
+        self.assertEqual(self.graph.dependents("footer.md", INCLUDE), ["blog/post.md"])
+        self.assertEqual(self.graph.dependents("footer.md", LINK), [])
+
+    def test_dependents_after_changes(self):
+        self.assertEqual(self.graph.dependents("about.md", LINK), ["blog/post.md", "index.md"])
+        self.graph.set_dependencies("index.md", LINK, [])
+        self.graph.remove_page("blog/post.md")
+        self.assertEqual(self.graph.dependents("about.md", LINK), [])
+
+    def test_targets(self):
+        self.assertEqual(self.graph.targets(LINK), ["about.md", "blog/post.md"])
+
+    def test_round_trip(self):
+        graph = DependencyGraph.from_dict(self.graph.to_dict())
+        self.assertEqual(graph.dependents("about.md", LINK), ["blog/post.md", "index.md"])
+
+class TestResolveLink(unittest.TestCase):
+    def setUp(self):
+        self.pages = {"index.md", "about.md", "blog/index.md", "blog/post.md"}
+
+    def test_external_links(self):
+        self.assertIsNone(resolve_link("index.md", "https://www.boot.dev", self.pages))
+        self.assertIsNone(resolve_link("index.md", "mailto:me@example.com", self.pages))
+        self.assertIsNone(resolve_link("index.md", "#section", self.pages))
+        self.assertIsNone(resolve_link("index.md", "", self.pages))
+
+    def test_absolute_links(self):
+        self.assertEqual(resolve_link("index.md", "/about.html", self.pages), "about.md")
+        self.assertEqual(resolve_link("index.md", "/blog/post", self.pages), "blog/post.md")
+        self.assertEqual(resolve_link("index.md", "/blog/", self.pages), "blog/index.md")
+        self.assertEqual(resolve_link("blog/post.md", "/", self.pages), "index.md")
+
+    def test_relative_links(self):
+        self.assertEqual(resolve_link("blog/index.md", "post.html#intro", self.pages), "blog/post.md")
+        self.assertEqual(resolve_link("blog/post.md", "../about.md", self.pages), "about.md")
+
+    def test_unknown_page(self):
+        self.assertEqual(resolve_link("index.md", "/missing.html", self.pages), "missing.md")
+
+if __name__ == "__main__":
+    unittest.main()
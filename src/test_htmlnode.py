@@ -1,6 +1,7 @@
+import io
 import unittest
-from htmlnode import HTMLNode, LeafNode, ParentNode
-from textnode import TextNode, TextType, text_node_to_html_node
+from htmlnode import HTMLNode, LeafNode, ParentNode, Props, walk, visit, transform, copy_tree, escape_attribute, escape_text
+from textnode import TextNode, TextType, text_node_to_html_node, text_nodes_to_html
 
 class TestHTMLNode(unittest.TestCase):
     def test_props_to_html_empty(self):
@@ -84,5 +85,283 @@ class TestParentNode(unittest.TestCase):
             '<div><span><a href="https://www.google.com">Click me!</a></span></div>'
         )                
 
+class TestCompactNodes(unittest.TestCase):
+    def test_nodes_have_no_instance_dict(self):
+        for node in (HTMLNode("p", "x"), LeafNode("b", "x"), ParentNode("div", [LeafNode("b", "x")])):
+            self.assertFalse(hasattr(node, "__dict__"))
+
+    def test_leaf_nodes_share_empty_children_and_props(self):
+        first = LeafNode("b", "one")
+        second = LeafNode("i", "two")
+        self.assertIs(first._children, second._children)
+        self.assertIs(first._props, second._props)
+        self.assertEqual(first.to_html(), "<b>one</b>")
+        self.assertIs(first._props, second._props)
+        self.assertEqual(first.props_to_html(), "")
+
+    def test_empty_props_and_children_are_mutable(self):
+        first = LeafNode("a", "x")
+        second = LeafNode("a", "y")
+        first.props["href"] = "/y"
+        self.assertEqual(first.to_html(), '<a href="/y">x</a>')
+        self.assertEqual(second.to_html(), "<a>y</a>")
+        self.assertEqual(second.props, {})
+
+        node = HTMLNode()
+        node.children.append(LeafNode(None, "x"))
+        self.assertEqual(len(node.children), 1)
+        self.assertEqual(HTMLNode().children, [])
+
+    def test_parent_node_with_none_children(self):
+        with self.assertRaises(ValueError):
+            ParentNode("div", None).to_html()
+
+    def test_repr(self):
+        node = HTMLNode("a", "Click me", props={"href": "https://example.com"})
+        self.assertEqual(repr(node), "HTMLNode(a, Click me, [], {'href': 'https://example.com'})")
+
+class TestStreamingHTML(unittest.TestCase):
+    def test_iter_html_matches_to_html(self):
+        grandchild_node = LeafNode("a", "Click me!", props={"href": "https://www.google.com"})
+        child_node = ParentNode("span", [grandchild_node, LeafNode(None, " and text")])
+        parent_node = ParentNode("div", [child_node, LeafNode("b", "bold")])
+        self.assertEqual("".join(parent_node.iter_html()), parent_node.to_html())
+
+    def test_iter_html_yields_chunks(self):
+        parent_node = ParentNode("p", [LeafNode(None, "Hello "), LeafNode("b", "world")])
+        self.assertEqual(list(parent_node.iter_html()), ["<p>", "Hello ", "<b>world</b>", "</p>"])
+
+    def test_write_to(self):
+        parent_node = ParentNode("div", [ParentNode("span", [LeafNode("b", "grandchild")])])
+        fp = io.StringIO()
+        parent_node.write_to(fp)
+        self.assertEqual(fp.getvalue(), "<div><span><b>grandchild</b></span></div>")
+
+    def test_leaf_write_to(self):
+        fp = io.StringIO()
+        LeafNode("p", "Hello, world!").write_to(fp)
+        self.assertEqual(fp.getvalue(), "<p>Hello, world!</p>")
+
+    def test_iter_html_errors_on_invalid_child(self):
+        parent_node = ParentNode("div", [ParentNode("span", [])])
+        with self.assertRaises(ValueError):
+            list(parent_node.iter_html())
+
+class TestProps(unittest.TestCase):
+    def test_props_become_props(self):
+        props = {"href": "/a"}
+        node = LeafNode("a", "x", props)
+        self.assertIs(type(node.props), Props)
+        self.assertEqual(node.props, props)
+        node.props["href"] = "/b"
+        self.assertEqual(props["href"], "/a")
+
+    def test_props_taken_from_another_node_are_copied(self):
+        first = LeafNode("a", "x", {"href": "/a"})
+        rendered = first.props_to_html()
+        second = LeafNode("a", "y", first.props)
+        second.props["href"] = "/z"
+        self.assertEqual(first.to_html(), '<a href="/a">x</a>')
+        self.assertEqual(second.to_html(), '<a href="/z">y</a>')
+        parent = ParentNode("p", [first], first.props)
+        self.assertIsNot(parent.props, first.props)
+        self.assertIs(parent.props_to_html(), rendered)
+
+    def test_rendered_once(self):
+        node = LeafNode("a", "x", {"href": "/a", "class": "big"})
+        first = node.props_to_html()
+        self.assertEqual(first, ' href="/a" class="big"')
+        self.assertIs(node.props_to_html(), first)
+        self.assertEqual(node.props_to_html(minify=True), " href=/a class=big")
+        self.assertIs(node.props_to_html(), first)
+
+    def test_mutation_invalidates(self):
+        node = LeafNode("a", "x", {"href": "/a"})
+        node.props_to_html()
+        node.props["href"] = "/b"
+        self.assertEqual(node.to_html(), '<a href="/b">x</a>')
+        node.props.update(title="t")
+        self.assertEqual(node.to_html(), '<a href="/b" title="t">x</a>')
+        del node.props["title"]
+        node.props |= {"id": "i"}
+        self.assertEqual(node.to_html(), '<a href="/b" id="i">x</a>')
+        node.props.pop("id")
+        node.props.setdefault("rel", "next")
+        self.assertEqual(node.to_html(minify=True), "<a href=/b rel=next>x</a>")
+        node.props.clear()
+        self.assertEqual(node.to_html(), "<a>x</a>")
+
+    def test_reassignment_invalidates(self):
+        node = LeafNode("a", "x", {"href": "/a"})
+        node.to_html()
+        node.props = {"href": "/b"}
+        self.assertEqual(node.to_html(), '<a href="/b">x</a>')
+        node.props = None
+        self.assertEqual(node.to_html(), "<a>x</a>")
+
+    def test_props_created_directly(self):
+        props = Props(href="/a")
+        self.assertEqual(props.to_html(), ' href="/a"')
+        self.assertEqual(props.copy().to_html(minify=True), " href=/a")
+
+    def test_copy_keeps_rendered_html(self):
+        node = LeafNode("a", "x", {"href": "/a"})
+        rendered = node.props_to_html()
+        copy = copy_tree(node)
+        self.assertIsNot(copy.props, node.props)
+        self.assertIs(copy.props_to_html(), rendered)
+        copy.props["href"] = "/b"
+        self.assertEqual(copy.props_to_html(), ' href="/b"')
+        self.assertIs(node.props_to_html(), rendered)
+
+    def test_common_and_other_attributes(self):
+        first = LeafNode("a", "x", {"href": "/a"}).props_to_html()
+        second = LeafNode("a", "x", {"href": "/b"}).props_to_html()
+        self.assertEqual((first, second), (' href="/a"', ' href="/b"'))
+        self.assertEqual(LeafNode("a", "x", {"data-x": "1"}).props_to_html(), ' data-x="1"')
+
+class TestEscaping(unittest.TestCase):
+    def test_clean_text_is_not_copied(self):
+        text = "".join(["plain ", "text > 1"])
+        self.assertIs(escape_text(text), text)
+        self.assertIs(escape_attribute(text), text)
+
+    def test_escape(self):
+        self.assertEqual(escape_text("a < b & \"c\""), 'a &lt; b &amp; "c"')
+        self.assertEqual(escape_attribute("a=\"1\" & b='2'"), "a=&quot;1&quot; &amp; b=&#x27;2&#x27;")
+
+    def test_leaf_value_and_props_are_escaped(self):
+        node = LeafNode("a", "Fish & <Chips>", {"href": "/search?q=a&b=\"c\""})
+        self.assertEqual(node.to_html(), '<a href="/search?q=a&amp;b=&quot;c&quot;">Fish &amp; &lt;Chips&gt;</a>')
+        self.assertEqual(LeafNode("a", "x", {"href": "/a?b&c"}).to_html(minify=True), "<a href=/a?b&amp;c>x</a>")
+        self.assertEqual(node.value, "Fish & <Chips>")
+
+    def test_escaped_value_is_cached(self):
+        node = LeafNode("code", "x < y")
+        self.assertEqual(node.to_html(), "<code>x &lt; y</code>")
+        self.assertIs(node._escaped_from, node.value)
+        escaped = node._escaped
+        node.to_html()
+        self.assertIs(node._escaped, escaped)
+        node.value = "x & y"
+        self.assertEqual(node.to_html(), "<code>x &amp; y</code>")
+
+    def test_parent_escapes_children(self):
+        node = ParentNode("p", [LeafNode(None, "1 < 2"), LeafNode("b", "&")])
+        self.assertEqual(node.to_html(), "<p>1 &lt; 2<b>&amp;</b></p>")
+
+    def test_single_quote_in_attribute(self):
+        # Safe inside double quotes, and it keeps a minified value quoted
+        node = LeafNode("img", "", {"alt": "it's"})
+        self.assertEqual(node.to_html(), '<img alt="it\'s"></img>')
+        self.assertEqual(node.to_html(minify=True), '<img alt="it\'s"></img>')
+
+    def test_non_string_values(self):
+        self.assertEqual(LeafNode("img", "", {"width": 100}).to_html(), '<img width="100"></img>')
+        self.assertEqual(ParentNode("p", [LeafNode("img", "", {"width": 100}), LeafNode("b", 5)]).to_html(),
+                         '<p><img width="100"></img><b>5</b></p>')
+        with self.assertRaises(ValueError):
+            ParentNode("p", [LeafNode("b", None)]).to_html()
+
+    def test_link_without_url(self):
+        link = TextNode("anchor", TextType.LINK)
+        self.assertEqual(text_node_to_html_node(link).to_html(), '<a href="None">anchor</a>')
+        self.assertEqual(text_nodes_to_html([link]), '<a href="None">anchor</a>')
+        self.assertEqual(text_nodes_to_html([link], minify=True), "<a href=None>anchor</a>")
+        image = TextNode("alt", TextType.IMAGE)
+        self.assertEqual(text_nodes_to_html([image]), text_node_to_html_node(image).to_html())
+
+class TestMinify(unittest.TestCase):
+    def test_leaf_collapses_whitespace(self):
+        node = LeafNode("p", "Some   text\n  over\tlines")
+        self.assertEqual(node.to_html(minify=True), "<p>Some text over lines</p>")
+        self.assertEqual(node.to_html(), "<p>Some   text\n  over\tlines</p>")
+
+    def test_attribute_quotes(self):
+        node = LeafNode("a", "link", {"href": "/docs/page.html", "title": "two words", "class": ""})
+        self.assertEqual(node.to_html(minify=True), '<a href=/docs/page.html title="two words" class="">link</a>')
+        self.assertEqual(LeafNode("a", "x", {"href": "a=b"}).to_html(minify=True), '<a href="a=b">x</a>')
+
+    def test_non_string_attribute_values(self):
+        self.assertEqual(LeafNode("img", "", {"width": 100}).to_html(minify=True), "<img width=100></img>")
+        self.assertEqual(LeafNode("a", "x", {"href": None}).to_html(minify=True), "<a href=None>x</a>")
+
+    def test_pre_and_code_keep_whitespace(self):
+        code = LeafNode("code", "def f():\n    return  1\n")
+        node = ParentNode("div", [
+            ParentNode("pre", [code, LeafNode(None, "  after\n")], {"class": "x"}),
+            LeafNode(None, "  outside  "),
+            code,
+        ])
+        self.assertEqual(
+            node.to_html(minify=True),
+            "<div><pre class=x><code>def f():\n    return  1\n</code>  after\n</pre> outside "
+            "<code>def f():\n    return  1\n</code></div>",
+        )
+
+    def test_minified_root_pre(self):
+        node = ParentNode("pre", [LeafNode(None, "a  b")])
+        self.assertEqual(node.to_html(minify=True), "<pre>a  b</pre>")
+
+    def test_minified_streaming(self):
+        node = ParentNode("p", [LeafNode(None, "Hello  "), LeafNode("b", "world")])
+        fp = io.StringIO()
+        node.write_to(fp, minify=True)
+        self.assertEqual(fp.getvalue(), "<p>Hello <b>world</b></p>")
+        self.assertEqual("".join(node.iter_html(minify=True)), node.to_html(minify=True))
+
+class TestTreeWalking(unittest.TestCase):
+    def setUp(self):
+        self.link = LeafNode("a", "link", props={"href": "https://example.com"})
+        self.bold = LeafNode("b", "bold")
+        self.span = ParentNode("span", [self.bold])
+        self.root = ParentNode("div", [self.span, self.link])
+
+    def test_walk_order(self):
+        events = [(node.tag, entering) for node, entering in walk(self.root)]
+        self.assertEqual(events, [
+            ("div", True), ("span", True), ("b", True), ("b", False),
+            ("span", False), ("a", True), ("a", False), ("div", False),
+        ])
+
+    def test_walk_leaf(self):
+        self.assertEqual(list(walk(self.bold)), [(self.bold, True), (self.bold, False)])
+
+    def test_visit(self):
+        pre = []
+        post = []
+        visit(self.root, pre=lambda node: pre.append(node.tag), post=lambda node: post.append(node.tag))
+        self.assertEqual(pre, ["div", "span", "b", "a"])
+        self.assertEqual(post, ["b", "span", "a", "div"])
+
+    def test_transform(self):
+        def upper_bold(node):
+            if node.tag == "b":
+                return LeafNode("strong", node.value.upper())
+            if node.tag == "a":
+                return None
+            return node
+
+        result = transform(self.root, upper_bold)
+        self.assertEqual(result.to_html(), "<div><span><strong>BOLD</strong></span></div>")
+        # The original tree is left untouched
+        self.assertEqual(self.root.to_html(), '<div><span><b>bold</b></span><a href="https://example.com">link</a></div>')
+
+    def test_copy_tree(self):
+        copy = copy_tree(self.root)
+        self.assertEqual(copy.to_html(), self.root.to_html())
+        self.assertIsNot(copy.children[1], self.link)
+        self.assertIsNot(copy.children[1].props, self.link.props)
+        copy.children[1].props["href"] = "https://changed.example.com"
+        self.assertEqual(self.link.props["href"], "https://example.com")
+
+    def test_deep_nesting(self):
+        node = LeafNode("b", "deep")
+        for _ in range(10000):
+            node = ParentNode("blockquote", [node])
+        html = node.to_html()
+        self.assertEqual(html, "<blockquote>" * 10000 + "<b>deep</b>" + "</blockquote>" * 10000)
+        self.assertEqual(sum(1 for _ in walk(node)), 20002)
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
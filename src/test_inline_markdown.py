@@ -335,6 +335,43 @@ class TestSplitNodesLink(unittest.TestCase):
             new_nodes,
         )
 
+    def test_duplicate_links(self):
+        node = TextNode(
+            "[same](https://example.com) and [same](https://example.com) again",
+            TextType.TEXT,
+        )
+        new_nodes = split_nodes_link([node])
+        self.assertListEqual(
+            [
+                TextNode("same", TextType.LINK, "https://example.com"),
+                TextNode(" and ", TextType.TEXT),
+                TextNode("same", TextType.LINK, "https://example.com"),
+                TextNode(" again", TextType.TEXT),
+            ],
+            new_nodes,
+        )
+
+    def test_link_matching_earlier_image(self):
+        # The link markdown also appears inside the image; only the real link is split out
+        node = TextNode(
+            "![logo](https://example.com/a.png) then [logo](https://example.com/a.png)",
+            TextType.TEXT,
+        )
+        new_nodes = split_nodes_link([node])
+        self.assertListEqual(
+            [
+                TextNode("![logo](https://example.com/a.png) then ", TextType.TEXT),
+                TextNode("logo", TextType.LINK, "https://example.com/a.png"),
+            ],
+            new_nodes,
+        )
+
+    def test_many_links(self):
+        node = TextNode("".join(f"[l{i}](https://example.com/{i}) " for i in range(500)), TextType.TEXT)
+        new_nodes = split_nodes_link([node])
+        self.assertEqual(len(new_nodes), 1000)
+        self.assertEqual(new_nodes[998], TextNode("l499", TextType.LINK, "https://example.com/499"))
+
     def test_malformed_link(self):
         node = TextNode(
             "This has a [malformed link](https://example.com",
@@ -453,5 +490,24 @@ class TestTextToTextNodes(unittest.TestCase):
         self.assertEqual(nodes[9].text_type, TextType.IMAGE)
         self.assertEqual(nodes[9].url, "https://example.com/image.jpg")
 
+    def test_text_with_unclosed_delimiter(self):
+        with self.assertRaises(ValueError):
+            text_to_textnodes("This has **unclosed bold")
+
+    def test_underscore_inside_link_url(self):
+        nodes = text_to_textnodes("See [the guide](https://example.com/getting_started) for _more_")
+        self.assertListEqual(
+            [
+                TextNode("See ", TextType.TEXT),
+                TextNode("the guide", TextType.LINK, "https://example.com/getting_started"),
+                TextNode(" for ", TextType.TEXT),
+                TextNode("more", TextType.ITALIC),
+            ],
+            nodes,
+        )
+
+    def test_empty_text(self):
+        self.assertListEqual([TextNode("", TextType.TEXT)], text_to_textnodes(""))
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,91 @@
+import json
+import os
+import tempfile
+import unittest
+
+import htmlnode
+import markdown_to_html_node
+from build import build_site
+from instrument import Tracer
+from markdown_to_html_node import markdown_to_html_node as render
+
+STAGES = {"markdown_to_blocks", "block_to_block_type", "text_to_textnodes", "to_html"}
+
+class TestTracer(unittest.TestCase):
+    def test_install_and_uninstall_restore_originals(self):
+        originals = (markdown_to_html_node.markdown_to_blocks, htmlnode.ParentNode.to_html)
+        tracer = Tracer()
+        tracer.install()
+        try:
+            self.assertIsNot(markdown_to_html_node.markdown_to_blocks, originals[0])
+            self.assertIsNot(htmlnode.ParentNode.to_html, originals[1])
+        finally:
+            tracer.uninstall()
+        self.assertEqual((markdown_to_html_node.markdown_to_blocks, htmlnode.ParentNode.to_html), originals)
+
+    def test_output_unchanged_and_stages_recorded(self):
+        markdown = "# Title\n\nSome **bold** text\n\n- one\n- two"
+        expected = render(markdown).to_html()
+        tracer = Tracer()
+        tracer.install()
+        try:
+            with tracer.page("index.md"):
+                html = render(markdown).to_html()
+        finally:
+            tracer.uninstall()
+        self.assertEqual(html, expected)
+        stages = tracer.pages["index.md"]
+        self.assertEqual(set(stages), STAGES | {"page"})
+        self.assertEqual(stages["markdown_to_blocks"][2], 1)
+        self.assertEqual(stages["block_to_block_type"][2], 3)
+        self.assertEqual(stages["to_html"][2], 1)
+
+    def test_not_recorded_when_uninstalled(self):
+        tracer = Tracer()
+        with tracer.page("index.md"):
+            render("# Title").to_html()
+        self.assertEqual(set(tracer.pages["index.md"]), {"page"})
+
+    def test_slowest_pages(self):
+        tracer = Tracer()
+        tracer._record("page", 0, 5, 5)
+        tracer.current_page = "a.md"
+        tracer._record("page", 0, 10, 8)
+        tracer.current_page = "b.md"
+        tracer._record("page", 0, 30, 20)
+        tracer._record("to_html", 0, 7, 7)
+        self.assertEqual(tracer.slowest_pages(), [("b.md", 30, 20, {"to_html": 7}), ("a.md", 10, 8, {})])
+        self.assertEqual(tracer.slowest_pages(1), [("b.md", 30, 20, {"to_html": 7})])
+        self.assertIn("b.md: 0.00", tracer.summary())
+
+class TestTracedBuild(unittest.TestCase):
+    def test_build_exports_chrome_trace(self):
+        with tempfile.TemporaryDirectory() as root:
+            content = os.path.join(root, "content")
+            os.makedirs(content)
+            for name in ("a", "b"):
+                with open(os.path.join(content, name + ".md"), "w", encoding="utf-8") as file:
+                    file.write(f"# {name}\n\nText with `code`")
+            template = os.path.join(root, "template.html")
+            with open(template, "w", encoding="utf-8") as file:
+                file.write("{{ Content }}")
+
+            tracer = Tracer()
+            tracer.install()
+            try:
+                report = build_site(content, template, os.path.join(root, "public"), os.path.join(root, "state.json"),
+                                    jobs=2, tracer=tracer)
+            finally:
+                tracer.uninstall()
+            self.assertEqual(report["built"], ["a.md", "b.md"])
+
+            trace_path = os.path.join(root, "trace.json")
+            tracer.export_chrome_trace(trace_path)
+            with open(trace_path, encoding="utf-8") as file:
+                events = json.load(file)["traceEvents"]
+        self.assertEqual({event["name"] for event in events}, STAGES | {"page"})
+        self.assertEqual({event["args"]["page"] for event in events}, {"a.md", "b.md"})
+        self.assertTrue(all(event["ph"] == "X" and event["dur"] >= 0 for event in events))
+
+if __name__ == "__main__":
+    unittest.main()
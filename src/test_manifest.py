@@ -0,0 +1,62 @@
+import json
+import os
+import unittest
+
+from fixtures import TempDirTestCase
+from manifest import diff_manifests, diff_path, load_manifest, scan_manifest, update_manifest
+
+class TestManifest(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        # Paths given to write() are relative to the output directory
+        self.dest = self.root = os.path.join(self.tmp.name, "public")
+        self.manifest = os.path.join(self.tmp.name, "manifest.json")
+        self.write("index.html", "<h1>Home</h1>")
+        self.write("blog/post.html", "<h1>Post</h1>")
+
+    def test_diff_path(self):
+        self.assertEqual(diff_path("out/manifest.json"), "out/manifest.diff.json")
+        self.assertEqual(diff_path("manifest"), "manifest.diff.json")
+
+    def test_diff_manifests(self):
+        previous = {"a": {"size": 1, "hash": "x"}, "b": {"size": 1, "hash": "y"}, "c": {"size": 1, "hash": "z"}}
+        current = {"a": {"size": 1, "hash": "x"}, "b": {"size": 1, "hash": "w"}, "d": {"size": 2, "hash": "v"}}
+        self.assertEqual(diff_manifests(previous, current), {"added": ["d"], "changed": ["b"], "removed": ["c"]})
+
+    def test_hash_reused_while_stat_matches(self):
+        files = scan_manifest(self.dest, {})
+        self.assertEqual(sorted(files), ["blog/post.html", "index.html"])
+        self.assertEqual(files["index.html"]["size"], len("<h1>Home</h1>"))
+        # A matching size and mtime is trusted, so the file isn't hashed again
+        previous = {"index.html": dict(files["index.html"], hash="cached")}
+        self.assertEqual(scan_manifest(self.dest, previous)["index.html"]["hash"], "cached")
+        previous["index.html"]["mtime_ns"] -= 1
+        self.assertEqual(scan_manifest(self.dest, previous)["index.html"]["hash"], files["index.html"]["hash"])
+
+    def test_update_manifest(self):
+        diff = update_manifest(self.manifest, self.dest)
+        self.assertEqual(diff, {"added": ["blog/post.html", "index.html"], "changed": [], "removed": []})
+        self.assertEqual(sorted(load_manifest(self.manifest)), ["blog/post.html", "index.html"])
+        with open(diff_path(self.manifest), encoding="utf-8") as file:
+            self.assertEqual(json.load(file), diff)
+
+        # Rewriting the same bytes gives a new mtime but no change
+        self.write("index.html", "<h1>Home</h1>")
+        self.write("blog/post.html", "<h1>Post, edited</h1>")
+        os.remove(os.path.join(self.dest, "index.html"))
+        self.write("about.html", "<h1>About</h1>")
+        self.assertEqual(
+            update_manifest(self.manifest, self.dest),
+            {"added": ["about.html"], "changed": ["blog/post.html"], "removed": ["index.html"]},
+        )
+        self.write("about.html", "<h1>About</h1>")
+        self.assertEqual(update_manifest(self.manifest, self.dest), {"added": [], "changed": [], "removed": []})
+
+    def test_manifest_inside_dest_is_left_out(self):
+        manifest = os.path.join(self.dest, "manifest.json")
+        update_manifest(manifest, self.dest)
+        self.assertEqual(update_manifest(manifest, self.dest), {"added": [], "changed": [], "removed": []})
+        self.assertEqual(sorted(load_manifest(manifest)), ["blog/post.html", "index.html"])
+
+if __name__ == "__main__":
+    unittest.main()
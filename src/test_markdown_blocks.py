@@ -1,5 +1,7 @@
-from markdown_blocks import markdown_to_blocks, block_to_block_type, BlockType
-import unittest, textwrap
+from markdown_blocks import markdown_to_blocks, block_to_block_type, BlockType, scan_blocks, scan_markdown_file
+from markdown_blocks import scan_mapped_blocks, scan_markdown_mmap
+import markdown_blocks
+import io, os, tempfile, unittest, textwrap
 
 class TestMarkdownToBlocks(unittest.TestCase):
 
@@ -133,6 +135,127 @@ class TestBlockToBlockType(unittest.TestCase):
     def test_paragraph(self):
         self.assertEqual(block_to_block_type("This is a paragraph"), BlockType.PARAGRAPH)
         self.assertEqual(block_to_block_type("Line 1\nLine 2"), BlockType.PARAGRAPH)
+class TestScanBlocks(unittest.TestCase):
+
+    def scan(self, md):
+        return list(scan_blocks(io.StringIO(md, newline="")))
+
+    def test_matches_markdown_to_blocks(self):
+        """Test that scanning gives the same blocks and types as the string based functions."""
+        md = textwrap.dedent("""\
+            # Heading
+
+              Paragraph with **bold** and _italic_.
+            Second line
+
+            ```
+            code block
+            ```
+
+            > Blockquote
+            > continues here
+               \t
+            - List item 1
+            - List item 2
+
+            1. First
+            2. Second
+        """)
+        expected = [(block_to_block_type(block), block) for block in markdown_to_blocks(md)]
+        self.assertEqual(self.scan(md), expected)
+        self.assertEqual(
+            [block_type for block_type, _ in expected],
+            [BlockType.HEADING, BlockType.PARAGRAPH, BlockType.CODE, BlockType.QUOTE,
+             BlockType.UNORDERED_LIST, BlockType.ORDERED_LIST],
+        )
+
+    def test_empty_and_whitespace(self):
+        """Test that empty or whitespace only input gives no blocks."""
+        self.assertEqual(self.scan(""), [])
+        self.assertEqual(self.scan("    \n \n\t\n  "), [])
+
+    def test_non_standard_line_endings(self):
+        """Test that \r and \r\n line endings split blocks like markdown_to_blocks."""
+        expected = [(BlockType.PARAGRAPH, "Block 1"), (BlockType.PARAGRAPH, "Block 2"), (BlockType.PARAGRAPH, "Block 3")]
+        self.assertEqual(self.scan("Block 1\rBlock 2\rBlock 3"), expected)
+        self.assertEqual(self.scan("Block 1\r\n\r\nBlock 2\r\n\r\nBlock 3"), expected)
+
+    def test_ordered_list_trailing_whitespace(self):
+        """Test that only the final line of a block is right stripped before classifying."""
+        self.assertEqual(self.scan("1. a\n2. \n\n"), [(BlockType.PARAGRAPH, "1. a\n2.")])
+
+    def test_scan_markdown_file(self):
+        """Test reading blocks straight from a file on disk."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "page.md")
+            with open(path, "w", encoding="utf-8", newline="") as file:
+                file.write("# Title\r\n\r\n- a\r\n- b\r\n")
+            self.assertEqual(
+                list(scan_markdown_file(path)),
+                [(BlockType.HEADING, "# Title"), (BlockType.UNORDERED_LIST, "- a\n- b")],
+            )
+
+    def test_scan_markdown_file_mixed_line_endings(self):
+        """Test that files decide old Mac line endings from the whole file, like markdown_to_blocks."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "page.md")
+            for md in ["a\nb\rc\n\nd", "a\rb\r\n\r\nc", "a\n\nb\rc", "a\rb\rc"]:
+                with open(path, "w", encoding="utf-8", newline="") as file:
+                    file.write(md)
+                expected = [(block_to_block_type(block), block) for block in markdown_to_blocks(md)]
+                self.assertEqual(list(scan_markdown_file(path)), expected, repr(md))
+
+    def test_first_line_ending_decides_without_old_mac(self):
+        """Test that lines alone decide old Mac line endings from the first line ending, unless told."""
+        lines = ["a\n", "b\r", "c\n", "\n", "d"]
+        self.assertEqual([block for _, block in scan_blocks(lines)], ["a\nb\nc", "d"])
+        self.assertEqual([block for _, block in scan_blocks(lines, old_mac=True)], ["a", "b", "c", "d"])
+
+class TestScanMappedBlocks(unittest.TestCase):
+
+    def expected(self, md):
+        return [(block_to_block_type(block), block) for block in markdown_to_blocks(md)]
+
+    def test_matches_markdown_to_blocks(self):
+        """Test that block boundaries found on the bytes give the same blocks as markdown_to_blocks."""
+        for md in [
+            "# Heading\n\n  Paragraph\nsecond line  \n \t \n\n- a\n- b\n\n1. x\n2. y\n",
+            "# Title\r\n\r\n> quote\r\n> more\r\n\r\n\r\n```\r\ncode\r\n```\r\n",
+            "Block 1\rBlock 2\r\rBlock 3\r",
+            "mixed\r\nline\rends\n\nnext",
+            "café\n\u00a0\u3000\n\u2003naïve\n\x1c\n\nend",
+            "\n\n\n   ",
+            "",
+        ]:
+            self.assertEqual(list(scan_mapped_blocks(md.encode("utf-8"))), self.expected(md), repr(md))
+
+    def test_scan_markdown_mmap(self):
+        """Test mapping files from disk, including empty ones which can't be mapped."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "page.md")
+            with open(path, "w", encoding="utf-8", newline="") as file:
+                file.write("# Title\r\n\r\n- a\r\n- b\r\n")
+            self.assertEqual(
+                list(scan_markdown_mmap(path)),
+                [(BlockType.HEADING, "# Title"), (BlockType.UNORDERED_LIST, "- a\n- b")],
+            )
+            with open(path, "w", encoding="utf-8"):
+                pass
+            self.assertEqual(list(scan_markdown_mmap(path)), [])
+
+    def test_scan_across_windows(self):
+        """Test that pages released behind the scan don't change the blocks."""
+        md = "".join(f"Paragraph {i} with some text\r\n\r\n" for i in range(2000))
+        window = markdown_blocks._MMAP_WINDOW
+        markdown_blocks._MMAP_WINDOW = 4096
+        try:
+            with tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, "page.md")
+                with open(path, "w", encoding="utf-8", newline="") as file:
+                    file.write(md)
+                self.assertEqual(list(scan_markdown_mmap(path)), self.expected(md))
+        finally:
+            markdown_blocks._MMAP_WINDOW = window
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
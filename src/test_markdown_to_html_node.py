@@ -1,7 +1,14 @@
+import os
+import tempfile
 import unittest
 
-from markdown_to_html_node import heading_block_to_html_node
+import markdown_to_html_node as renderer
+from markdown_to_html_node import heading_block_to_html_node, markdown_to_html_node, enable_render_cache, disable_render_cache, render_cache_stats
+from markdown_to_html_node import enable_disk_cache, disable_disk_cache, LazyBlockNode, write_markdown_mmap
+from markdown_to_html_node import enable_fast_inline, disable_fast_inline
+from htmlnode import copy_tree
 from htmlnode import HTMLNode, LeafNode, ParentNode
+from textnode import InlineHTMLNode
 
 class TestHeadingBlockToHTMLNode(unittest.TestCase):
 
@@ -39,4 +46,215 @@ class TestHeadingBlockToHTMLNode(unittest.TestCase):
         markdown = "#### This is **bold and _nested italic_**"
         htmlnode = heading_block_to_html_node(markdown)
         html = htmlnode.to_html()
-        self.assertEqual(html, "<h4>This is <b>bold and <i>nested italic</i></b>")
\ No newline at end of file
+        self.assertEqual(html, "<h4>This is <b>bold and <i>nested italic</i></b>")
+
+class TestMarkdownToHTMLNode(unittest.TestCase):
+
+    def test_paragraphs(self):
+        md = "This is **bolded** paragraph\ntext in a p\ntag here\n\nThis is another paragraph with _italic_ text and `code` here\n"
+        html = markdown_to_html_node(md).to_html()
+        self.assertEqual(
+            html,
+            "<div><p>This is <b>bolded</b> paragraph text in a p tag here</p>"
+            "<p>This is another paragraph with <i>italic</i> text and <code>code</code> here</p></div>",
+        )
+
+    def test_code_block(self):
+        md = "```python\nThis is text that _should_ remain\nthe **same** even with inline stuff\n```"
+        html = markdown_to_html_node(md).to_html()
+        self.assertEqual(
+            html,
+            "<div><pre><code>This is text that _should_ remain\nthe **same** even with inline stuff\n</code></pre></div>",
+        )
+
+    def test_quote(self):
+        md = "> This is a\n> blockquote with **bold**"
+        html = markdown_to_html_node(md).to_html()
+        self.assertEqual(html, "<div><blockquote>This is a blockquote with <b>bold</b></blockquote></div>")
+
+    def test_lists(self):
+        md = "- one\n- _two_\n\n1. first\n2. [second](https://example.com)"
+        html = markdown_to_html_node(md).to_html()
+        self.assertEqual(
+            html,
+            "<div><ul><li>one</li><li><i>two</i></li></ul>"
+            '<ol><li>first</li><li><a href="https://example.com">second</a></li></ol></div>',
+        )
+
+    def test_heading(self):
+        html = markdown_to_html_node("# Title\n\ntext").to_html()
+        self.assertEqual(html, "<div><h1>Title</h1><p>text</p></div>")
+
+class TestRenderCache(unittest.TestCase):
+
+    def setUp(self):
+        enable_render_cache(max_entries=16)
+
+    def tearDown(self):
+        disable_render_cache()
+
+    def test_cached_output_is_identical(self):
+        md = "## Note\n\nRepeated **text** with a [link](https://example.com)\n\n## Note\n\n- a\n- _b_"
+        expected = "<div><h2>Note</h2><p>Repeated <b>text</b> with a <a href=\"https://example.com\">link</a></p><h2>Note</h2><ul><li>a</li><li><i>b</i></li></ul></div>"
+        self.assertEqual(markdown_to_html_node(md).to_html(), expected)
+        self.assertEqual(markdown_to_html_node(md).to_html(), expected)
+        stats = render_cache_stats()
+        self.assertEqual(stats["block"]["misses"], 3)
+        self.assertEqual(stats["block"]["hits"], 5)
+
+    def test_cached_trees_are_copies(self):
+        md = "[link](https://example.com)"
+        first = markdown_to_html_node(md)
+        first.children[0].children[0].props["href"] = "https://changed.example.com"
+        first.children[0].tag = "section"
+        second = markdown_to_html_node(md)
+        self.assertEqual(second.to_html(), '<div><p><a href="https://example.com">link</a></p></div>')
+
+    def test_disabled_by_default(self):
+        disable_render_cache()
+        self.assertIsNone(render_cache_stats())
+
+class TestDiskCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        enable_disk_cache(os.path.join(self.tmp.name, "blocks.sqlite"))
+        self.classified = []
+        self.original = renderer.block_to_block_type
+        # Recording which blocks actually get parsed
+        renderer.block_to_block_type = lambda block: self.classified.append(block) or self.original(block)
+
+    def tearDown(self):
+        renderer.block_to_block_type = self.original
+        disable_disk_cache()
+        self.tmp.cleanup()
+
+    def test_unchanged_blocks_are_not_parsed_again(self):
+        md = "# Title\n\nFirst **paragraph**\n\n```\ncode < 1\n```"
+        expected = "<div><h1>Title</h1><p>First <b>paragraph</b></p><pre><code>code &lt; 1\n</code></pre></div>"
+        self.assertEqual(markdown_to_html_node(md).to_html(), expected)
+        self.assertEqual(len(self.classified), 3)
+
+        self.classified = []
+        self.assertEqual(markdown_to_html_node(md).to_html(), expected)
+        self.assertEqual(self.classified, [])
+
+        edited = md.replace("First", "Edited")
+        self.assertEqual(markdown_to_html_node(edited).to_html(), expected.replace("First", "Edited"))
+        self.assertEqual(self.classified, ["Edited **paragraph**"])
+        stats = render_cache_stats()["disk"]
+        self.assertEqual((stats["hits"], stats["misses"], stats["entries"]), (5, 4, 4))
+
+    def test_minified_blocks_are_cached_separately(self):
+        md = "Some   _spaced_   text"
+        self.assertEqual(markdown_to_html_node(md).to_html(), "<div><p>Some   <i>spaced</i>   text</p></div>")
+        self.assertEqual(markdown_to_html_node(md, minify=True).to_html(minify=True), "<div><p>Some <i>spaced</i> text</p></div>")
+        self.assertEqual(markdown_to_html_node(md).to_html(), "<div><p>Some   <i>spaced</i>   text</p></div>")
+
+    def test_serialized_with_other_minify_setting(self):
+        md = "para   with   spaces\n\n```\nx  =  1\n```"
+        plain = "<div><p>para   with   spaces</p><pre><code>x  =  1\n</code></pre></div>"
+        minified = "<div><p>para with spaces</p><pre><code>x  =  1\n</code></pre></div>"
+        disable_disk_cache()
+        self.assertEqual(markdown_to_html_node(md).to_html(), plain)
+        self.assertEqual(markdown_to_html_node(md).to_html(minify=True), minified)
+        enable_disk_cache(os.path.join(self.tmp.name, "blocks.sqlite"))
+        for _ in range(2):
+            self.assertEqual(markdown_to_html_node(md).to_html(minify=True), minified)
+            self.assertEqual(markdown_to_html_node(md, minify=True).to_html(), plain)
+            self.assertEqual(markdown_to_html_node(md, minify=True).to_html(minify=True), minified)
+
+    def test_lazy_is_rejected(self):
+        with self.assertRaises(ValueError):
+            markdown_to_html_node("text", lazy=True)
+
+    def test_repeated_block_in_one_page(self):
+        md = "Same\n\nSame"
+        self.assertEqual(markdown_to_html_node(md).to_html(), "<div><p>Same</p><p>Same</p></div>")
+        self.assertEqual(len(self.classified), 1)
+
+class TestFastInline(unittest.TestCase):
+    MARKDOWN = (
+        "# Fish & **Chips**\n\n"
+        "Text  with   runs, `a  <  b` and [a link](/search?q=a&b=\"c\") here\n"
+        "and an ![image of x < y](/img.png?w=1&h=2).\n\n"
+        "> quoted _text_ &amp;\n> more\n\n"
+        "- one **1**\n- two `2`\n\n"
+        "1. first\n2. second [x](/x)\n\n"
+        "```\ncode  **kept**\n```"
+    )
+
+    def tearDown(self):
+        disable_fast_inline()
+        disable_render_cache()
+
+    def test_same_html(self):
+        """Test that rendering without LeafNodes gives exactly the same HTML, minified or not."""
+        expected = [markdown_to_html_node(self.MARKDOWN).to_html(minify) for minify in (False, True)]
+        enable_fast_inline()
+        node = markdown_to_html_node(self.MARKDOWN)
+        self.assertEqual([node.to_html(minify) for minify in (False, True)], expected)
+        self.assertFalse(any(isinstance(child, LeafNode) for child in node.children[1].children))
+        self.assertIsInstance(node.children[1].children[0], InlineHTMLNode)
+
+    def test_same_html_with_render_cache(self):
+        """Test that memoized trees with inline nodes render the same the second time."""
+        expected = markdown_to_html_node(self.MARKDOWN).to_html()
+        enable_fast_inline()
+        enable_render_cache(max_entries=16)
+        self.assertEqual(markdown_to_html_node(self.MARKDOWN).to_html(), expected)
+        self.assertEqual(markdown_to_html_node(self.MARKDOWN).to_html(), expected)
+
+class TestLazyBlocks(unittest.TestCase):
+    md = "# Title\n\nSome **bold** text\n\n> quoted\n\n- a\n- [link](/a.html)\n\n```\nx = 1\n```"
+
+    def test_same_html(self):
+        lazy = markdown_to_html_node(self.md, lazy=True)
+        self.assertEqual(lazy.to_html(), markdown_to_html_node(self.md).to_html())
+        lazy = markdown_to_html_node(self.md, lazy=True)
+        self.assertEqual(lazy.to_html(minify=True), markdown_to_html_node(self.md).to_html(minify=True))
+
+    def test_blocks_are_parsed_on_first_use(self):
+        parsed = []
+        original = renderer.text_to_textnodes
+        renderer.text_to_textnodes = lambda text: parsed.append(text) or original(text)
+        try:
+            node = markdown_to_html_node(self.md, lazy=True)
+            self.assertTrue(all(isinstance(child, LazyBlockNode) for child in node.children))
+            self.assertEqual(parsed, [])
+            # An excerpt of the first two blocks only parses those
+            excerpt = ParentNode("div", node.children[:2]).to_html()
+            self.assertEqual(excerpt, "<div><h1>Title</h1><p>Some <b>bold</b> text</p></div>")
+            self.assertEqual(parsed, ["Title", "Some **bold** text"])
+            self.assertEqual([child.parsed for child in node.children], [True, True, False, False, False])
+            node.to_html()
+            node.to_html()
+            self.assertEqual(len(parsed), 5)
+        finally:
+            renderer.text_to_textnodes = original
+
+    def test_child_access(self):
+        node = markdown_to_html_node(self.md, lazy=True)
+        self.assertEqual(node.children[3].tag, "ul")
+        self.assertEqual(node.children[3].children[1].children[0].props, {"href": "/a.html"})
+        self.assertIsNone(node.children[3].value)
+        node.children[1].tag = "section"
+        node.children[1].props = {"class": "intro"}
+        self.assertEqual(node.children[1].to_html(), '<section class="intro">Some <b>bold</b> text</section>')
+
+    def test_tree_functions(self):
+        node = markdown_to_html_node(self.md, lazy=True)
+        self.assertEqual(copy_tree(node).to_html(), markdown_to_html_node(self.md).to_html())
+
+class TestWriteMarkdownMmap(unittest.TestCase):
+    md = "# Title\r\n\r\nSome **bold**   text\r\n\r\n> quoted\r\n\r\n- a\r\n- [link](/a.html)\r\n\r\n```\r\nx  =  1\r\n```\r\n"
+
+    def test_same_html(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "page.md")
+            with open(path, "w", encoding="utf-8", newline="") as file:
+                file.write(self.md)
+            for minify in (False, True):
+                with open(os.path.join(tmp, "page.html"), "w+", encoding="utf-8") as out:
+                    write_markdown_mmap(path, out, minify)
+                    out.seek(0)
+                    self.assertEqual(out.read(), markdown_to_html_node(self.md).to_html(minify))
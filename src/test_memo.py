@@ -0,0 +1,54 @@
+import unittest
+
+from memo import LRUCache
+
+class TestLRUCache(unittest.TestCase):
+    def test_get_and_put(self):
+        cache = LRUCache(max_entries=2)
+        self.assertIsNone(cache.get("a"))
+        cache.put("a", 1)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.get("missing", "default"), "default")
+        self.assertEqual(cache.stats(), {"entries": 1, "bytes": 0, "hits": 1, "misses": 2, "evictions": 0})
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(max_entries=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.get("c"), 3)
+        self.assertEqual(cache.evictions, 1)
+
+    def test_byte_budget(self):
+        cache = LRUCache(max_entries=100, max_bytes=10)
+        cache.put("a", 1, size=4)
+        cache.put("b", 2, size=4)
+        cache.put("c", 3, size=4)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.total_bytes, 8)
+        self.assertIsNone(cache.get("a"))
+
+    def test_oversized_entry_not_stored(self):
+        cache = LRUCache(max_bytes=10)
+        cache.put("big", 1, size=11)
+        self.assertEqual(len(cache), 0)
+
+    def test_replacing_entry(self):
+        cache = LRUCache(max_bytes=10)
+        cache.put("a", 1, size=6)
+        cache.put("a", 2, size=3)
+        self.assertEqual(cache.total_bytes, 3)
+        self.assertEqual(cache.get("a"), 2)
+
+    def test_clear(self):
+        cache = LRUCache()
+        cache.put("a", 1, size=5)
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.total_bytes, 0)
+
+if __name__ == "__main__":
+    unittest.main()
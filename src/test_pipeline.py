@@ -0,0 +1,107 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from build import write_file
+from pipeline import IOPipeline
+
+class TestPrefetch(unittest.TestCase):
+    def test_every_item_loaded_once(self):
+        pipeline = IOPipeline(threads=4, read_depth=2)
+        items = list(range(50))
+        results = dict(pipeline.prefetch(items, lambda item: item * 2))
+        self.assertEqual(results, {item: item * 2 for item in items})
+        stats = pipeline.stats()["read_queue"]
+        self.assertEqual(stats["items"], 50)
+        self.assertLessEqual(stats["max_depth"], 2)
+
+    def test_backpressure(self):
+        # A slow consumer keeps the readers from loading more than the queue holds plus one item per reader
+        pipeline = IOPipeline(threads=2, read_depth=3)
+        loaded = []
+        lock = threading.Lock()
+
+        def load(item):
+            with lock:
+                loaded.append(item)
+            return item
+
+        consumed = 0
+        for _ in pipeline.prefetch(list(range(30)), load):
+            time.sleep(0.005)
+            consumed += 1
+            with lock:
+                self.assertLessEqual(len(loaded) - consumed, 3 + 2)
+        self.assertEqual(consumed, 30)
+        self.assertGreater(pipeline.stats()["read_queue"]["put_wait"], 0)
+
+    def test_load_errors_are_raised(self):
+        def load(item):
+            if item == 3:
+                raise FileNotFoundError(item)
+            return item
+
+        pipeline = IOPipeline(threads=2, read_depth=4)
+        with self.assertRaises(FileNotFoundError):
+            for _ in pipeline.prefetch(list(range(10)), load):
+                pass
+
+    def test_stopping_early(self):
+        before = set(threading.enumerate())
+        pipeline = IOPipeline(threads=3, read_depth=1)
+        results = pipeline.prefetch(list(range(100)), lambda item: item)
+        next(results)
+        results.close()
+        # Readers blocked on the full queue are gone once the generator is closed
+        self.assertEqual(set(threading.enumerate()) - before, set())
+
+class TestWriter(unittest.TestCase):
+    def test_writes_in_batches(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            pipeline = IOPipeline(write_depth=4, write_batch=8, write_file=write_file)
+            for i in range(20):
+                pipeline.write(os.path.join(tmp, f"dir{i % 3}", f"{i}.html"), f"page {i}".encode())
+            pipeline.flush()
+            for i in range(20):
+                with open(os.path.join(tmp, f"dir{i % 3}", f"{i}.html"), "rb") as file:
+                    self.assertEqual(file.read(), f"page {i}".encode())
+            stats = pipeline.stats()
+            self.assertEqual(stats["write_queue"]["items"], 20)
+            self.assertLessEqual(stats["write_queue"]["max_depth"], 4)
+            self.assertTrue(1 <= stats["write_batches"] <= 20)
+
+    def test_write_errors_are_raised(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            blocker = os.path.join(tmp, "file")
+            with open(blocker, "w"):
+                pass
+            pipeline = IOPipeline(write_file=write_file)
+            pipeline.write(os.path.join(blocker, "page.html"), b"x")
+            with self.assertRaises(OSError):
+                pipeline.flush()
+            # The pipeline keeps working after an error was reported
+            pipeline.write(os.path.join(tmp, "page.html"), b"y")
+            pipeline.flush()
+            with open(os.path.join(tmp, "page.html"), "rb") as file:
+                self.assertEqual(file.read(), b"y")
+
+    def test_other_write_errors_are_raised(self):
+        # More writes than the queue holds after a failure, a stopped writer would leave write() blocked
+        def fail(path, data):
+            raise ValueError(path)
+
+        pipeline = IOPipeline(write_depth=2, write_file=fail)
+        with self.assertRaises(ValueError):
+            for i in range(10):
+                pipeline.write(f"page{i}.html", b"x")
+            pipeline.flush()
+        self.assertEqual(pipeline.flush(), [])
+
+    def test_write_needs_write_file(self):
+        with self.assertRaises(ValueError):
+            IOPipeline().write("page.html", b"x")
+
+if __name__ == "__main__":
+    unittest.main()
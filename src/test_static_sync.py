@@ -0,0 +1,93 @@
+import os
+import unittest
+from unittest import mock
+
+import static_sync
+from fixtures import TempDirTestCase
+from static_sync import copy_file, sync_static
+
+class TestStaticSync(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.static = os.path.join(self.tmp.name, "static")
+        self.dest = os.path.join(self.tmp.name, "public")
+        self.write(os.path.join(self.static, "styles.css"), "body {}")
+        self.write(os.path.join(self.static, "images", "logo.png"), "png" * 100)
+
+    def test_first_sync_copies_everything(self):
+        report = sync_static(self.static, self.dest)
+        self.assertEqual(report["files"], ["images/logo.png", "styles.css"])
+        self.assertEqual((report["copied"], report["skipped"]), (2, 0))
+        self.assertEqual(report["bytes_copied"], 307)
+        self.assertEqual(self.read(os.path.join(self.dest, "images", "logo.png")), "png" * 100)
+        source_stat = os.stat(os.path.join(self.static, "styles.css"))
+        self.assertEqual(os.stat(os.path.join(self.dest, "styles.css")).st_mtime_ns, source_stat.st_mtime_ns)
+
+    def test_unchanged_files_are_skipped(self):
+        sync_static(self.static, self.dest)
+        report = sync_static(self.static, self.dest, ["images/logo.png", "styles.css"])
+        self.assertEqual((report["copied"], report["skipped"], report["bytes_skipped"]), (0, 2, 307))
+
+    def test_changed_file_is_copied(self):
+        sync_static(self.static, self.dest)
+        path = os.path.join(self.static, "styles.css")
+        self.write(path, "body { color: red }")
+        report = sync_static(self.static, self.dest)
+        self.assertEqual(report["copied"], 1)
+        self.assertEqual(self.read(os.path.join(self.dest, "styles.css")), "body { color: red }")
+
+    def test_checksum_ignores_touched_files(self):
+        sync_static(self.static, self.dest)
+        path = os.path.join(self.static, "styles.css")
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        self.assertEqual(sync_static(self.static, self.dest, checksum=True)["copied"], 0)
+        self.assertEqual(sync_static(self.static, self.dest)["copied"], 1)
+
+    def test_orphans_are_removed_only_if_synced_before(self):
+        sync_static(self.static, self.dest)
+        self.write(os.path.join(self.dest, "index.html"), "<p>page</p>")
+        self.write(os.path.join(self.dest, "about.html"), "<p>page</p>")
+        os.remove(os.path.join(self.static, "images", "logo.png"))
+        report = sync_static(self.static, self.dest, ["about.html", "images/logo.png", "styles.css"], keep=["about.html"])
+        self.assertEqual(report["removed"], ["images/logo.png"])
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "images")))
+        self.assertTrue(os.path.exists(os.path.join(self.dest, "index.html")))
+        self.assertTrue(os.path.exists(os.path.join(self.dest, "about.html")))
+
+    def test_hardlink(self):
+        report = sync_static(self.static, self.dest, hardlink=True)
+        self.assertEqual((report["linked"], report["copied"], report["bytes_copied"]), (2, 0, 0))
+        self.assertTrue(os.path.samefile(os.path.join(self.static, "styles.css"), os.path.join(self.dest, "styles.css")))
+        self.assertEqual(sync_static(self.static, self.dest, hardlink=True)["skipped"], 2)
+
+    def test_hardlink_falls_back_to_copy(self):
+        with mock.patch("os.link", side_effect=OSError("cross-device link")):
+            report = sync_static(self.static, self.dest, hardlink=True)
+        self.assertEqual((report["linked"], report["copied"]), (0, 2))
+        self.assertFalse(os.path.samefile(os.path.join(self.static, "styles.css"), os.path.join(self.dest, "styles.css")))
+
+    def test_copy_without_kernel_copies(self):
+        target = os.path.join(self.tmp.name, "copy.png")
+        with mock.patch.object(static_sync, "_KERNEL_COPIES", []):
+            copy_file(os.path.join(self.static, "images", "logo.png"), target)
+        self.assertEqual(self.read(target), "png" * 100)
+
+    def test_copy_continues_after_refused_kernel_copy(self):
+        def refuse(source_fd, target_fd, offset, count):
+            raise OSError("not supported")
+
+        def partial(source_fd, target_fd, offset, count):
+            # Copies at most 7 bytes and then gives up
+            if offset >= 7:
+                raise OSError("not supported")
+            data = os.pread(source_fd, min(count, 7 - offset), offset)
+            return os.pwrite(target_fd, data, offset)
+
+        target = os.path.join(self.tmp.name, "copy.png")
+        with mock.patch.object(static_sync, "_KERNEL_COPIES", [refuse, partial]):
+            copy_file(os.path.join(self.static, "images", "logo.png"), target)
+        self.assertEqual(self.read(target), "png" * 100)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import io
+import os
+import tempfile
+import unittest
+
+from template import Template, TemplateCache, minify_source
+
+class TestTemplate(unittest.TestCase):
+    def test_segments(self):
+        template = Template("<title>{{ Title }}</title><body>{{Content}}</body>")
+        self.assertEqual(template.static, ["<title>", "</title><body>", "</body>"])
+        self.assertEqual(template.slots, ["Title", "Content"])
+
+    def test_render(self):
+        template = Template("<title>{{ Title }}</title><h1>{{ Title }}</h1>{{ Content }}")
+        html = template.render({"Title": "Hello", "Content": "<p>Hi</p>"})
+        self.assertEqual(html, "<title>Hello</title><h1>Hello</h1><p>Hi</p>")
+
+    def test_no_placeholders(self):
+        self.assertEqual(Template("<p>static</p>").render({}), "<p>static</p>")
+
+    def test_missing_value_keeps_placeholder(self):
+        template = Template("{{ Title }} {{ Unknown }}")
+        self.assertEqual(template.render({"Title": "Hello"}), "Hello {{ Unknown }}")
+
+    def test_values_are_not_parsed_again(self):
+        template = Template("{{ Title }}|{{ Content }}")
+        self.assertEqual(template.render({"Title": "{{ Content }}", "Content": "x"}), "{{ Content }}|x")
+
+    def test_write_to(self):
+        fp = io.StringIO()
+        Template("<b>{{ Title }}</b>").write_to(fp, {"Title": "Hello"})
+        self.assertEqual(fp.getvalue(), "<b>Hello</b>")
+
+    def test_minify(self):
+        source = (
+            "<html>\n  <head>\n    <title>{{ Title }}</title>\n  </head>\n  <body>\n"
+            "    <!-- keep  this -->\n    <pre>a\n  b</pre>\n    <script>\n  x = 1\n</script>\n"
+            "    {{ Content }}\n  </body>\n</html>\n"
+        )
+        self.assertEqual(
+            minify_source(source),
+            "<html> <head> <title>{{ Title }}</title> </head> <body> <!-- keep  this --> <pre>a\n  b</pre> "
+            "<script>\n  x = 1\n</script> {{ Content }} </body> </html>",
+        )
+        template = Template(source, minify=True)
+        self.assertEqual(template.slots, ["Title", "Content"])
+        self.assertEqual(template.hash, Template(source).hash)
+
+class TestTemplateCache(unittest.TestCase):
+    def test_reuses_and_invalidates(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "template.html")
+            with open(path, "w", encoding="utf-8") as file:
+                file.write("<b>{{ Title }}</b>")
+            cache = TemplateCache()
+            first = cache.get(path)
+            self.assertIs(cache.get(path), first)
+
+            with open(path, "w", encoding="utf-8") as file:
+                file.write("<i>{{ Title }}</i>")
+            stat = os.stat(path)
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+            second = cache.get(path)
+            self.assertIsNot(second, first)
+            self.assertEqual(second.render({"Title": "x"}), "<i>x</i>")
+            self.assertNotEqual(second.hash, first.hash)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,6 @@
 import unittest
 
-from textnode import TextNode, TextType, text_node_to_html_node
+from textnode import TextNode, TextType, text_node_to_html_node, text_nodes_to_html
 
 
 class TestTextNode(unittest.TestCase):
@@ -32,6 +32,15 @@ class TestTextNode(unittest.TestCase):
         node = TextNode("This is a text node", TextType.LINK, "https://www.google.com")
         self.assertEqual(node.__repr__(), 'TextNode(This is a text node, link, https://www.google.com)')
 
+    def test_text_type_from_value(self):
+        node = TextNode("This is a text node", "bold")
+        self.assertEqual(node.text_type, TextType.BOLD)
+        self.assertEqual(node, TextNode("This is a text node", TextType.BOLD))
+
+    def test_no_instance_dict(self):
+        node = TextNode("This is a text node", TextType.BOLD)
+        self.assertFalse(hasattr(node, "__dict__"))
+
 class TestTextNodeToHTML(unittest.TestCase):
     def test_test(self):
         node = TextNode("This is a text node", TextType.TEXT)
@@ -72,5 +81,52 @@ class TestTextNodeToHTML(unittest.TestCase):
         self.assertEqual(html_node.props.get("src"), "test.jpg")
         self.assertEqual(html_node.props.get("alt"), "Test image")
 
+class TestTextNodesToHTML(unittest.TestCase):
+    def test_matches_leaf_node_rendering(self):
+        nodes = [
+            TextNode("Plain ", TextType.TEXT),
+            TextNode("bold", TextType.BOLD),
+            TextNode("italic", TextType.ITALIC),
+            TextNode("code", TextType.CODE),
+            TextNode("a link", TextType.LINK, "https://www.google.com"),
+            TextNode("an image", TextType.IMAGE, "test.jpg"),
+        ]
+        expected = "".join(text_node_to_html_node(node).to_html() for node in nodes)
+        self.assertEqual(text_nodes_to_html(nodes), expected)
+
+    def test_minified_matches_leaf_node_rendering(self):
+        nodes = [
+            TextNode("Plain  \n text ", TextType.TEXT),
+            TextNode("bold  text", TextType.BOLD),
+            TextNode("italic\ttext", TextType.ITALIC),
+            TextNode("code  text", TextType.CODE),
+            TextNode("a  link", TextType.LINK, "https://www.google.com"),
+            TextNode("an image", TextType.IMAGE, "test.jpg"),
+        ]
+        expected = "".join(text_node_to_html_node(node).to_html(minify=True) for node in nodes)
+        self.assertEqual(text_nodes_to_html(nodes, minify=True), expected)
+        self.assertIn("<code>code  text</code>", expected)
+        self.assertIn('<img src=test.jpg alt="an image"></img>', expected)
+
+    def test_escaping_matches_leaf_node_rendering(self):
+        nodes = [
+            TextNode("a < b & c", TextType.TEXT),
+            TextNode("<b>", TextType.BOLD),
+            TextNode("if x < y && y > z", TextType.CODE),
+            TextNode("Q&A", TextType.LINK, "/search?q=\"a\"&b"),
+            TextNode("it's \"quoted\"", TextType.IMAGE, "a&b.png"),
+        ]
+        for minify in (False, True):
+            expected = "".join(text_node_to_html_node(node).to_html(minify) for node in nodes)
+            self.assertEqual(text_nodes_to_html(nodes, minify), expected)
+        self.assertIn("<code>if x &lt; y &amp;&amp; y &gt; z</code>", expected)
+
+    def test_empty_list(self):
+        self.assertEqual(text_nodes_to_html([]), "")
+
+    def test_missing_text(self):
+        with self.assertRaises(ValueError):
+            text_nodes_to_html([TextNode(None, TextType.BOLD)])
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
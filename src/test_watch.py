@@ -0,0 +1,51 @@
+import os
+import unittest
+
+from fixtures import TempDirTestCase
+from watch import Watcher, snapshot
+
+class TestWatcher(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.content = os.path.join(self.tmp.name, "content")
+        self.template = os.path.join(self.tmp.name, "template.html")
+        os.makedirs(os.path.join(self.content, "blog"))
+        self.write(os.path.join(self.content, "index.md"), "# Home")
+        self.write(self.template, "{{ Content }}")
+
+    def test_snapshot(self):
+        signatures = snapshot([self.content, self.template, os.path.join(self.tmp.name, "missing")])
+        self.assertEqual(sorted(signatures), [os.path.join(self.content, "index.md"), self.template])
+
+    def test_poll(self):
+        watcher = Watcher([self.content, self.template])
+        self.assertEqual(watcher.poll(), set())
+
+        index = os.path.join(self.content, "index.md")
+        self.write(index, "# Home page")
+        post = os.path.join(self.content, "blog", "post.md")
+        self.write(post, "# Post")
+        self.assertEqual(watcher.poll(), {index, post})
+        self.assertEqual(watcher.poll(), set())
+
+        os.remove(post)
+        self.assertEqual(watcher.poll(), {post})
+
+    def test_wait_for_changes_debounces(self):
+        index = os.path.join(self.content, "index.md")
+        saves = [
+            lambda: None,
+            lambda: self.write(index, "# First save"),
+            lambda: self.write(self.template, "<main>{{ Content }}</main>"),
+            lambda: None,
+        ]
+
+        def fake_sleep(seconds):
+            saves.pop(0)()
+
+        watcher = Watcher([self.content, self.template], sleep=fake_sleep)
+        self.assertEqual(watcher.wait_for_changes(), {index, self.template})
+        self.assertEqual(saves, [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,4 @@
-from htmlnode import LeafNode
+from htmlnode import HTMLNode, LeafNode, collapse_whitespace, escape_attribute, escape_text, format_attribute
 from enum import Enum
 
 class TextType(Enum):
@@ -10,9 +10,12 @@ class TextType(Enum):
     IMAGE = "image"
 
 class TextNode:
+    __slots__ = ("text", "text_type", "url")
+
     def __init__(self, text, text_type, url=None):
         self.text = text
-        self.text_type = TextType(text_type)
+        # Only converting when given a raw value, most callers already pass a TextType
+        self.text_type = text_type if text_type.__class__ is TextType else TextType(text_type)
         self.url = url
 
     def __eq__(self, other):
@@ -32,14 +35,88 @@ def text_node_to_html_node(text_node):
     elif text_node.text_type == TextType.CODE:
         return LeafNode("code", text_node.text)
     elif text_node.text_type == TextType.LINK:
-        node = LeafNode("a", text_node.text)
-        node.props["href"] = text_node.url
-        return node
+        return LeafNode("a", text_node.text, {"href": text_node.url})
     elif text_node.text_type == TextType.IMAGE:
-        node = LeafNode("img", "")
-        node.props["src"] = text_node.url
-        node.props["alt"] = text_node.text
-        return node
+        return LeafNode("img", "", {"src": text_node.url, "alt": text_node.text})
     else:
         raise Exception("TextType not supported")
-    
\ No newline at end of file
+
+# Fast path: rendering inline nodes straight to HTML without building LeafNode objects.
+# Each renderer produces exactly what text_node_to_html_node(node).to_html() would.
+def _render_text(text_node):
+    return escape_text(text_node.text)
+
+def _render_bold(text_node):
+    return f"<b>{escape_text(text_node.text)}</b>"
+
+def _render_italic(text_node):
+    return f"<i>{escape_text(text_node.text)}</i>"
+
+def _render_code(text_node):
+    return f"<code>{escape_text(text_node.text)}</code>"
+
+def _render_link(text_node):
+    return f'<a href="{escape_attribute(text_node.url)}">{escape_text(text_node.text)}</a>'
+
+def _render_image(text_node):
+    return f'<img src="{escape_attribute(text_node.url)}" alt="{escape_attribute(text_node.text)}"></img>'
+
+_TEXT_NODE_RENDERERS = {
+    TextType.TEXT: _render_text,
+    TextType.BOLD: _render_bold,
+    TextType.ITALIC: _render_italic,
+    TextType.CODE: _render_code,
+    TextType.LINK: _render_link,
+    TextType.IMAGE: _render_image,
+}
+
+def _render_text_minified(text_node):
+    return collapse_whitespace(escape_text(text_node.text))
+
+def _render_bold_minified(text_node):
+    return f"<b>{collapse_whitespace(escape_text(text_node.text))}</b>"
+
+def _render_italic_minified(text_node):
+    return f"<i>{collapse_whitespace(escape_text(text_node.text))}</i>"
+
+def _render_link_minified(text_node):
+    return f"<a {format_attribute('href', text_node.url, True)}>{collapse_whitespace(escape_text(text_node.text))}</a>"
+
+def _render_image_minified(text_node):
+    return f"<img {format_attribute('src', text_node.url, True)} {format_attribute('alt', text_node.text, True)}></img>"
+
+# Code keeps its whitespace
+_MINIFIED_TEXT_NODE_RENDERERS = {
+    TextType.TEXT: _render_text_minified,
+    TextType.BOLD: _render_bold_minified,
+    TextType.ITALIC: _render_italic_minified,
+    TextType.CODE: _render_code,
+    TextType.LINK: _render_link_minified,
+    TextType.IMAGE: _render_image_minified,
+}
+
+def text_nodes_to_html(text_nodes, minify=False):
+    renderers = _MINIFIED_TEXT_NODE_RENDERERS if minify else _TEXT_NODE_RENDERERS
+    parts = []
+    for text_node in text_nodes:
+        render = renderers.get(text_node.text_type)
+        if render is None:
+            raise Exception("TextType not supported")
+        if text_node.text is None:
+            raise ValueError("Leaf nodes must have a value")
+        parts.append(render(text_node))
+    return "".join(parts)
+
+class InlineHTMLNode(HTMLNode):
+    # Stands in for the LeafNodes of a run of TextNodes and renders them with text_nodes_to_html,
+    # so a block's inline spans never become LeafNode objects
+    __slots__ = ()
+
+    def __init__(self, text_nodes):
+        super().__init__(value=text_nodes)
+
+    def to_html(self, minify=False):
+        return text_nodes_to_html(self.value, minify)
+
+    def iter_html(self, minify=False):
+        yield text_nodes_to_html(self.value, minify)
@@ -0,0 +1,113 @@
+import argparse
+import os
+import time
+
+from build import SiteBuilder
+from instrument import Tracer
+from main import add_build_arguments, configure, print_report
+
+def file_signature(path):
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+def snapshot(paths):
+    # Signature of every file under the given files and directories, missing paths are skipped
+    signatures = {}
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                for name in files:
+                    file_path = os.path.join(root, name)
+                    try:
+                        signatures[file_path] = file_signature(file_path)
+                    except FileNotFoundError:
+                        pass
+        elif os.path.exists(path):
+            signatures[path] = file_signature(path)
+    return signatures
+
+class Watcher:
+    def __init__(self, paths, interval=0.25, debounce=0.2, sleep=time.sleep):
+        self.paths = paths
+        self.interval = interval
+        self.debounce = debounce
+        self.sleep = sleep
+        self.signatures = snapshot(paths)
+
+    def poll(self):
+        # Paths added, removed or modified since the last poll
+        current = snapshot(self.paths)
+        previous = self.signatures
+        changed = {path for path in current.keys() | previous.keys() if current.get(path) != previous.get(path)}
+        self.signatures = current
+        return changed
+
+    def wait_for_changes(self):
+        # Blocks until something changed, then keeps collecting until a debounce window passes quietly,
+        # so an editor saving several files at once triggers a single rebuild
+        changed = set()
+        while not changed:
+            self.sleep(self.interval)
+            changed = self.poll()
+        while True:
+            self.sleep(self.debounce)
+            more = self.poll()
+            if not more:
+                return changed
+            changed |= more
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Rebuild the static site whenever its sources change.")
+    add_build_arguments(parser)
+    parser.add_argument("--interval", type=float, default=0.25, help="seconds between polls")
+    parser.add_argument("--debounce", type=float, default=0.2, help="quiet seconds to wait before rebuilding")
+    return parser.parse_args(argv)
+
+def export_trace(tracer, path):
+    # Each rebuild overwrites the trace with its own timings
+    if tracer is None:
+        return
+    tracer.export_chrome_trace(path)
+    print(tracer.summary())
+    tracer.reset()
+
+def main(argv=None):
+    args = parse_args(argv)
+    configure(args)
+    tracer = None
+    if args.trace:
+        tracer = Tracer()
+        tracer.install()
+    # One builder for the whole session, so state, dependency graph and worker pool stay warm between rebuilds
+    builder = SiteBuilder(
+        args.content, args.template, args.dest, args.state, args.static, args.includes, args.jobs, args.templates, tracer,
+        args.hardlink_static, args.checksum_static, args.gzip, args.gzip_min_size, args.minify, args.io_threads,
+        args.read_ahead, args.write_queue, args.manifest
+    )
+    watcher = Watcher([args.content, args.template, args.templates, args.static, args.includes], args.interval, args.debounce)
+    try:
+        start = time.perf_counter()
+        print_report(builder.build(), time.perf_counter() - start, args.explain)
+        export_trace(tracer, args.trace)
+        print(f"Watching {args.content}, {args.template}, {args.templates}, {args.static} and {args.includes} for changes...")
+        while True:
+            changed = watcher.wait_for_changes()
+            print(f"{len(changed)} changed: {', '.join(sorted(changed))}")
+            start = time.perf_counter()
+            try:
+                report = builder.build()
+            except Exception as error:
+                # A broken page shouldn't stop the watcher, the next save gets another try
+                print(f"Build failed: {error}")
+                continue
+            print_report(report, time.perf_counter() - start, args.explain)
+            export_trace(tracer, args.trace)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        builder.close()
+        if tracer is not None:
+            tracer.uninstall()
+
+if __name__ == "__main__":
+    main()